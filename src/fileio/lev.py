@@ -10,6 +10,7 @@ import struct
 from dataclasses import dataclass, field
 from typing import List
 from pathlib import Path
+import numpy as np
 from logger import get_logger
 
 logger = get_logger()
@@ -17,6 +18,23 @@ logger = get_logger()
 
 LEV_HEADER_STRUCT = "<LLLLffLLLLLL"
 LEV_TERRAIN_POINT_STRUCT = "<fHHBBBBBBBB"
+# same layout as LEV_TERRAIN_POINT_STRUCT, so the terrain can be read and written as
+# ... one structured array rather than a python object per point
+LEV_TERRAIN_POINT_DTYPE = np.dtype(
+    [
+        ("height", "<f4"),
+        ("normal", "<u2"),
+        ("flags", "<u2"),
+        ("palette_index", "u1"),
+        ("flow_direction", "u1"),
+        ("strata_index", "u1"),
+        ("mat", "u1"),
+        ("texture_dir", "u1"),
+        ("u_off", "u1"),
+        ("v_off", "u1"),
+        ("ai_node_type", "u1"),
+    ]
+)
 
 
 @dataclass
@@ -55,40 +73,6 @@ class _LevHeader:
         )
 
 
-@dataclass
-class _LevTerrainPoint:
-    """Container class for a terrain point"""
-
-    height: float
-    normal: int
-    flags: int = 0
-    palette_index: int = 0
-    flow_direction: int = 0
-    strata_index: int = 0
-    mat: int = 0
-    texture_dir: int = 0
-    u_off: int = 0
-    v_off: int = 0
-    ai_node_type: int = 0
-
-    def pack(self) -> bytes:
-        """Pack terrain point into bytes"""
-        return struct.pack(
-            LEV_TERRAIN_POINT_STRUCT,
-            self.height,
-            self.normal,
-            self.flags,
-            self.palette_index,
-            self.flow_direction,
-            self.strata_index,
-            self.mat,
-            self.texture_dir,
-            self.u_off,
-            self.v_off,
-            self.ai_node_type,
-        )
-
-
 @dataclass
 class _Color:
     """RGB color data"""
@@ -108,7 +92,9 @@ class LevFile:
 
     full_file_path: str
     header: _LevHeader = None
-    terrain_points: List[_LevTerrainPoint] = field(default_factory=list)
+    terrain_points: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=LEV_TERRAIN_POINT_DTYPE)
+    )
     object_data: bytes = b""
     model_data: bytes = b""
     colours: List[_Color] = field(default_factory=list)
@@ -138,12 +124,10 @@ class LevFile:
         terrain_start = struct.calcsize(LEV_HEADER_STRUCT)
         terrain_end = self.header.object_list_offset
         terrain_data = self.data[terrain_start:terrain_end]
-        self.terrain_points = []
-        for i in range(0, len(terrain_data), struct.calcsize(LEV_TERRAIN_POINT_STRUCT)):
-            point_data = terrain_data[i : i + struct.calcsize(LEV_TERRAIN_POINT_STRUCT)]
-            self.terrain_points.append(
-                _LevTerrainPoint(*struct.unpack(LEV_TERRAIN_POINT_STRUCT, point_data))
-            )
+        # (copied, so the points are writeable rather than a view of the raw bytes)
+        self.terrain_points = np.frombuffer(
+            terrain_data, dtype=LEV_TERRAIN_POINT_DTYPE
+        ).copy()
         logger.info(f"Loaded {len(self.terrain_points)} terrain points")
 
         # import the object list data
@@ -238,7 +222,7 @@ class LevFile:
             logger.info("Wrote header")
 
             # pack and write the terrain points
-            f.write(b"".join(point.pack() for point in self.terrain_points))
+            f.write(self.terrain_points.tobytes())
             logger.info(f"Wrote {len(self.terrain_points)} terrain points")
 
             # write the object data
@@ -99,7 +99,8 @@ class PatFile:
 
         Args:
             title (str): Title for the patrol record
-            coordinates (List[Tuple[float, float, float]], optional): List of coordinate tuples. Defaults to None.
+            coordinates (List[Tuple[float, float, float]], optional): List of coordinate tuples
+                (or an (N, 3) array of coordinates). Defaults to None.
 
         Returns:
             PatrolRecord: The newly created patrol record
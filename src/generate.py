@@ -260,6 +260,7 @@ def generate_new_map(
         # STEP 14 - SAVE -------------------------------------------------------
         progress_callback("Saving all files")
         logger.info("Saving all files to output location")
+        terrain_handler.write_to_lev()
         for file in [lev_data, cfg_data, ob3_data, ars_data, pat_data, ail_data]:
             file.save(exe_parent / NEW_LEVEL_NAME, NEW_LEVEL_NAME)
         # save ait in special place
@@ -35,11 +35,13 @@ def generate_minimap(
     stride_z = terrain_data.length // 128
 
     # Downsample using calculated strides
-    reshaped_terrain = terrain_data.terrain_points[::stride_x, ::stride_z]
+    reshaped_mats = terrain_data.mats[::stride_x, ::stride_z]
+    reshaped_heights = terrain_data.heights[::stride_x, ::stride_z]
 
     # If the downsampled size is still too large (due to rounding), take the first 128x128
-    if reshaped_terrain.shape[0] > 128 or reshaped_terrain.shape[1] > 128:
-        reshaped_terrain = reshaped_terrain[:128, :128]
+    if reshaped_mats.shape[0] > 128 or reshaped_mats.shape[1] > 128:
+        reshaped_mats = reshaped_mats[:128, :128]
+        reshaped_heights = reshaped_heights[:128, :128]
 
     # Step 2 - generate a texture lookup list from the config file
     logger.info("Step 2: Generating texture color lookup table...")
@@ -49,18 +51,14 @@ def generate_minimap(
     # ... and apply the average colour of the terrain at that position
     logger.info("Step 3: Applying terrain textures to minimap...")
     minimap = np.zeros((128, 128, 3), dtype=np.uint8)  # 3 for RGB channels
-    for row_id in range(128):
-        for col_id in range(128):
-            # use the material of this pixel to get the colour, and apply
-            # ... to the minimap
-            applied_texture = reshaped_terrain[row_id, col_id].mat
-            minimap[row_id, col_id] = minimap_texture_lookup[applied_texture]
+    # use the material of each pixel to look up its colour, and apply to the
+    # ... minimap (for every pixel at once)
+    colour_lookup = np.array(minimap_texture_lookup).astype(np.uint8)
+    minimap[:] = colour_lookup[reshaped_mats]
 
     # Step 4 - apply water with blue colour for now
     logger.info("Step 4: Applying water coloring...")
-    minimap[
-        np.array([[point.height for point in row] for row in reshaped_terrain]) < -8
-    ] = (0, 0, 255)
+    minimap[reshaped_heights < -8] = (0, 0, 255)
 
     # Step 5 - load template map file, apply palette and save
     logger.info("Step 5: Applying palette and saving minimap...")
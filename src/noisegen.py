@@ -7,11 +7,100 @@ Noise generation functions for terrain, textures etc
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 import random
 import numpy as np
 from perlin_numpy import generate_fractal_noise_2d
 
 
+# below this many weights, a binary search of the cumulative weights is
+# ... cheaper than the two lookups needed by the alias table
+_SMALL_TABLE_SIZE = 8
+
+
+class _AliasTable:
+    """Vose alias table, allowing O(1) draws from a fixed set of weights once the
+    table has been built (which is O(k) in the number of weights). Small tables
+    draw by searching the cumulative weights instead
+    """
+
+    def __init__(self, keys: tuple, weights: tuple):
+        """Builds the probability and alias lists using Vose's algorithm
+
+        Args:
+            keys (tuple): Items to select from
+            weights (tuple): Weight/likelihood of each item
+        """
+        n_keys = len(weights)
+        # keys are held in an object array so draws can be gathered in one
+        # ... indexing call (assigned one by one so tuple keys stay whole)
+        self.keys = np.empty(n_keys, dtype=object)
+        for i, key in enumerate(keys):
+            self.keys[i] = key
+        total = sum(weights)
+        self.cumulative = np.cumsum(np.asarray(weights, dtype=np.float64))
+        self.total = float(total)
+        # scale the weights so the average is 1, then split into two stacks
+        scaled = [weight * n_keys / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        # entries left on either stack at the end keep their whole column
+        self.prob = np.ones(n_keys, dtype=np.float64)
+        self.alias = np.arange(n_keys, dtype=np.int32)
+        while small and large:
+            s_idx = small.pop()
+            l_idx = large.pop()
+            self.prob[s_idx] = scaled[s_idx]
+            self.alias[s_idx] = l_idx
+            # the large entry donates the remainder of the small entry's column
+            scaled[l_idx] = scaled[l_idx] + scaled[s_idx] - 1
+            if scaled[l_idx] < 1:
+                small.append(l_idx)
+            else:
+                large.append(l_idx)
+
+    def sample_many(self, n: int, noise_generator: "NoiseGenerator") -> list:
+        """Draws n items from the table
+
+        Args:
+            n (int): Number of items to draw
+            noise_generator (NoiseGenerator): Noise generator to draw with
+
+        Returns:
+            list: List of n items, weighted by the table's weights
+        """
+        if len(self.keys) < _SMALL_TABLE_SIZE:
+            # ... (searching right of each threshold skips zero weight keys)
+            thresholds = noise_generator.rng.random(n) * self.total
+            picks = np.searchsorted(self.cumulative, thresholds, side="right")
+            return self.keys[picks].tolist()
+        # pick a column for every draw, then keep it or take its alias
+        # ... depending on a uniform draw against the column probability
+        columns = noise_generator.rng.integers(0, len(self.keys), size=n)
+        uniform = noise_generator.rng.random(n)
+        picks = np.where(uniform < self.prob[columns], columns, self.alias[columns])
+        return self.keys[picks].tolist()
+
+
+@lru_cache(maxsize=None)
+def _build_alias_table(keys: tuple, weights: tuple) -> _AliasTable:
+    return _AliasTable(keys, weights)
+
+
+def _alias_for(in_dict: dict) -> _AliasTable:
+    """Returns the (cached) alias table for a weighted dictionary. The cache is
+    keyed on a snapshot of the dictionary contents, so a dictionary changing
+    will not return a stale table
+
+    Args:
+        in_dict (dict): Dictionary where keys are items and values are their weights
+
+    Returns:
+        _AliasTable: Alias table for the dictionary
+    """
+    return _build_alias_table(tuple(in_dict.keys()), tuple(in_dict.values()))
+
+
 @dataclass
 class NoiseGenerator:
     seed: int = 0
@@ -24,6 +113,8 @@ class NoiseGenerator:
             self.seed = int(np.random.rand() * (2**32 - 1))
             random.seed(self.seed)
             np.random.seed(self.seed)
+        # generator used for batched (vectorised) draws
+        self.rng = np.random.default_rng(self.seed)
 
     def get_seed(self):
         # get the current seed form numpy
@@ -32,6 +123,22 @@ class NoiseGenerator:
     def randint(self, min, max):
         return np.random.randint(min, max)
 
+    def integers(
+        self, min: int, max: int, size: int | tuple, dtype: type = np.int64
+    ) -> np.ndarray:
+        """Draws an array of random integers in one call
+
+        Args:
+            min (int): Lowest integer to draw (inclusive)
+            max (int): Highest integer to draw (exclusive)
+            size (int | tuple): Number of integers to draw, or the shape to draw
+            dtype (type, optional): Integer dtype to draw. Defaults to np.int64.
+
+        Returns:
+            np.ndarray: Array of random integers
+        """
+        return self.rng.integers(min, max, size=size, dtype=dtype)
+
     def random_noisemap(
         self,
         width: int,
@@ -50,8 +157,11 @@ class NoiseGenerator:
         """
         # create perlin noise map
         map = generate_fractal_noise_2d((height, width), (8, 8), 5, persistence=0.4)
-        # scale the entire map to have a value between 0 and 1
-        map = (map - np.min(map)) / (np.max(map) - np.min(map))
+        # scale the entire map to have a value between 0 and 1 (in place, with the
+        # ... min and max each found once)
+        map_min, map_max = np.min(map), np.max(map)
+        map -= map_min
+        map /= map_max - map_min
         # apply floor/cutoff (typically used for terrain)
         map[map < cutoff] = 0
         return map
@@ -65,18 +175,14 @@ class NoiseGenerator:
         Returns:
             tuple[int, int]: The x and y coordinates of the selected point in the array
         """
-        # iterate over the array dimensions, creating a list of tuples if
-        # ... the array value is > 0
-        possible_values = [
-            (x, z)
-            for x in range(arr.shape[0])
-            for z in range(arr.shape[1])
-            if arr[x, z] > 0
-        ]
-        # select a random value from the possible_values
-        result = possible_values[self.randint(0, len(possible_values))]
-        # deconstruct
-        return result[0], result[1]
+        # find the flat (row-major) indices of every entry > 0, which is the same
+        # ... order as scanning the array row by row
+        possible_indices = np.flatnonzero(arr > 0)
+        # select a random index from the possible_indices
+        index = int(possible_indices[self.randint(0, len(possible_indices))])
+        # deconstruct back into x and z
+        x, z = divmod(index, arr.shape[1])
+        return x, z
 
     def select_random_from_list(self, in_list: list) -> object:
         """Selects a random object from a list
@@ -123,9 +229,28 @@ class NoiseGenerator:
         Returns:
             object: Random object from the dictionary, weighted by the likelihood values
         """
-        # Create a flat list where each key appears value times
-        weighted_keys = []
-        for key, weight in in_dict.items():
-            weighted_keys.extend([key] * weight)
-        # Select randomly from this weighted list
-        return self.select_random_from_list(weighted_keys)
+        if not in_dict:
+            raise ValueError("Cannot select from an empty dictionary")
+        # Pick a position in the (virtual) flat list where each key appears value
+        # ... times, then find which key it falls in using the cached cumulative
+        # ... weights (rather than building the flat list each call)
+        table = _alias_for(in_dict)
+        position = self.randint(0, int(table.total))
+        return table.keys[np.searchsorted(table.cumulative, position, side="right")]
+
+    def select_many_from_weighted_dict(self, in_dict: dict, n: int) -> list:
+        """Selects n random objects from a dictionary, where the values are weights.
+        Intended for repeated draws from the same dictionary (e.g. populating a
+        zone), as the weights are only processed once into an alias table
+
+        Args:
+            in_dict (dict): Dictionary to select from, where keys are items and values
+                are their weights/likelihoods
+            n (int): Number of objects to select
+
+        Returns:
+            list: Random objects from the dictionary, weighted by the likelihood values
+        """
+        if n <= 0 or not in_dict:
+            return []
+        return _alias_for(in_dict).sample_many(n, self)
@@ -14,12 +14,12 @@ logger = get_logger()
 
 from dataclasses import dataclass
 from enum import IntEnum, auto
-from pathlib import Path
-from typing import Optional, Union
+from functools import lru_cache
+from typing import Callable, Optional, Union
 
 import numpy as np
 
-from fileio.ob3 import Ob3File, MAP_SCALER
+from fileio.ob3 import Ob3File
 from noisegen import NoiseGenerator
 from models import (
     Team,
@@ -36,7 +36,126 @@ from object_containers import (
     TEMPLATE_ALIEN_AA,
     TEMPLATE_ALIEN_RADAR,
 )
-from noisegen import NoiseGenerator
+
+# scenery objects (and how many of each) to add, in placement order
+SCENERY_OBJECTS = (
+    ("troprockcd", 8),
+    ("troprockbd", 7),
+    ("troprockad", 6),
+    ("troprockcw", 5),
+    ("troprockaw", 2),
+    ("palm1", 80),
+    ("plant1", 30),
+    ("palm2", 50),
+    ("palm3", 25),
+    ("rubblea", 5),
+    ("rubbleb", 5),
+    ("rubblec", 5),
+    ("rubbled", 5),
+    ("rubblee", 5),
+)
+
+# next size down for each zone size, used when a zone does not fit
+_SMALLER_ZONE_SIZE = {
+    size: ZoneSize(size.value - 1) for size in ZoneSize if size > ZoneSize.TINY
+}
+
+
+def _and_masks(masks: list[np.ndarray], shape: tuple[int, int]) -> np.ndarray:
+    """ANDs together any number of masks (where non-zero is allowed) into a new
+    boolean mask. Each mask is combined in place into the result, so no
+    temporary arrays are created regardless of the input dtypes
+
+    Args:
+        masks (list[np.ndarray]): Masks to combine, all of the given shape
+        shape (tuple[int, int]): Shape of the masks
+
+    Returns:
+        np.ndarray: Boolean mask, True only where every mask is non-zero
+    """
+    result = np.ones(shape, dtype=bool)
+    for mask in masks:
+        np.logical_and(result, mask, out=result)
+    return result
+
+
+def _nonzero_bounding_box(mask: np.ndarray, border: int = 0) -> tuple[slice, slice]:
+    """Returns the bounding box of the non-zero cells in a mask, grown by border
+    cells on every side (clipped to the mask)
+
+    Args:
+        mask (np.ndarray): 2D mask
+        border (int, optional): Cells to grow the box by. Defaults to 0.
+
+    Returns:
+        tuple[slice, slice]: x and z slices of the box (empty if the mask is empty)
+    """
+    xs = np.flatnonzero(mask.any(axis=1))
+    zs = np.flatnonzero(mask.any(axis=0))
+    if xs.size == 0:
+        return slice(0, 0), slice(0, 0)
+    return (
+        slice(max(0, xs[0] - border), xs[-1] + border + 1),
+        slice(max(0, zs[0] - border), zs[-1] + border + 1),
+    )
+
+
+@lru_cache(maxsize=16)
+def _disk_mask(radius: int) -> np.ndarray:
+    """Returns a (read-only) boolean disk of the given radius, centred in a square
+    of side 2 * radius + 1. Cached, as the same few radii are used repeatedly
+
+    Args:
+        radius (int): Radius of the disk (integer)
+
+    Returns:
+        np.ndarray: Boolean disk mask
+    """
+    offsets = np.arange(-radius, radius + 1)
+    disk = offsets[:, None] ** 2 + offsets[None, :] ** 2 <= radius * radius
+    disk.flags.writeable = False
+    return disk
+
+
+def _dilate_with_disk(mask: np.ndarray, radius: int) -> np.ndarray:
+    """Grows every non-zero cell of a mask into a disk of the given radius, giving
+    the same result as stamping a disk around each cell individually (but in a
+    handful of whole-array operations). Each row of the disk is a run of cells,
+    so the mask is first grown along z using a cumulative sum, then those rows
+    are shifted along x and combined.
+
+    Args:
+        mask (np.ndarray): 2D mask to dilate (non-zero cells are dilated)
+        radius (int): Radius of the disk (integer, same units as the mask cells)
+
+    Returns:
+        np.ndarray: Boolean mask, True within radius of any non-zero input cell
+    """
+    width, length = mask.shape
+    result = np.zeros((width, length), dtype=bool)
+    # running count of set cells along z, with a leading zero column so the
+    # ... count in [lo, hi) is cumulative[:, hi] - cumulative[:, lo]
+    cumulative = np.zeros((width, length + 1), dtype=np.int32)
+    np.cumsum(mask != 0, axis=1, out=cumulative[:, 1:])
+    z = np.arange(length)
+    # each row of the disk covers z +/- half_width
+    half_widths = _disk_mask(radius).sum(axis=1) // 2
+    grown_rows = {}
+    for dx in range(-radius, radius + 1):
+        if abs(dx) >= width:
+            continue
+        half_width = int(half_widths[dx + radius])
+        if half_width not in grown_rows:
+            lo = np.clip(z - half_width, 0, length)
+            hi = np.clip(z + half_width + 1, 0, length)
+            grown_rows[half_width] = (cumulative[:, hi] - cumulative[:, lo]) > 0
+        rows = grown_rows[half_width]
+        # a set cell in row x covers row x + dx
+        if dx >= 0:
+            result[dx:] |= rows[: width - dx]
+        else:
+            result[:dx] |= rows[-dx:]
+    return result
 
 
 class LocationEnum(IntEnum):
@@ -57,9 +176,51 @@ class ObjectHandler:
             (
                 self.terrain_handler.width,
                 self.terrain_handler.length,
-            )
+            ),
+            dtype=np.uint8,
         )
         self.zones = []
+        # zone masks, keyed by keep-clear radius (None for each zone's own radius),
+        # ... storing (number of zones already applied, mask)
+        self._zone_mask_cache = {}
+        # terrain derived masks, keyed by mask type and arguments
+        self._mask_cache = {}
+        # bumped whenever the object mask changes (see _update_cached_object_mask)
+        self._object_mask_version = 0
+        # final _find_location masks, keyed by arguments, storing (versions, mask)
+        self._location_mask_cache = {}
+
+    def _get_cached_mask(self, key: tuple, build_mask: Callable) -> np.ndarray:
+        """Returns a terrain derived mask from the cache, only building it (via
+        build_mask) if it is missing or the terrain has changed since it was built.
+        The returned mask is read-only, as it is shared between callers
+
+        Args:
+            key (tuple): Cache key, unique to the mask type and its arguments
+            build_mask (Callable): Function taking no arguments which builds the mask
+
+        Returns:
+            np.ndarray: The (read-only) mask
+        """
+        revision = self.terrain_handler.revision
+        cached = self._mask_cache.get(key)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        mask = build_mask()
+        mask.flags.writeable = False
+        self._mask_cache[key] = (revision, mask)
+        return mask
+
+    def _get_heights(self) -> np.ndarray:
+        """Returns the terrain heights (in LEV 3D space) as a 2D array, read from the
+        terrain once per terrain revision rather than once per lookup
+
+        Returns:
+            np.ndarray: The (read-only) height array, indexed [x, z]
+        """
+        return self._get_cached_mask(
+            ("heights",), self.terrain_handler._get_height_2d_array
+        )
 
     def _update_mask_grid_with_radius(
         self, location_grid: np.ndarray, x: int, z: int, radius: int, set_to: int = 0
@@ -81,16 +242,20 @@ class ObjectHandler:
         z_min = max(0, z - radius)
         z_max = min(self.terrain_handler.length, z + radius + 1)
 
-        # For integer radius, we can just iterate through the square and check distance
-        radius_sq = radius * radius  # Square once instead of sqrt
-        for i in range(x_min, x_max):
-            dx = i - x
-            dx_sq = dx * dx
-            for j in range(z_min, z_max):
-                dz = j - z
-                # If point is within radius, set it
-                if dx_sq + dz * dz <= radius_sq:
-                    location_grid[i, j] = set_to
+        # nothing to do if the circle is entirely off the grid
+        if x_min >= x_max or z_min >= z_max:
+            return location_grid
+
+        # For integer radius, we can just use the cached disk for this radius,
+        # ... cropped to the part of the square which is on the grid
+        disk = _disk_mask(radius)
+        square = location_grid[x_min:x_max, z_min:z_max]
+        square[
+            disk[
+                x_min - x + radius : x_max - x + radius,
+                z_min - z + radius : z_max - z + radius,
+            ]
+        ] = set_to
 
         return location_grid
 
@@ -105,6 +270,7 @@ class ObjectHandler:
         self._cached_object_mask = self._update_mask_grid_with_radius(
             self._cached_object_mask, x, z, required_radius, set_to=0
         )
+        self._object_mask_version += 1
 
     def _get_binary_transition_mask(self, input_mask: np.ndarray) -> np.ndarray:
         """Generates a boolean edge transition mask, used for object radius checks
@@ -119,22 +285,20 @@ class ObjectHandler:
             np.ndarray: Mask of edges from the input mask
         """
         # Create output mask of same shape as input
-        transition_mask = np.zeros_like(input_mask, dtype=int)
-
-        # Check horizontal transitions (left to right)
-        horizontal_transitions = (input_mask[:, 1:] != input_mask[:, :-1]).astype(int)
-        transition_mask[:, 1:] += horizontal_transitions
-        transition_mask[:, :-1] += horizontal_transitions
+        transition_mask = np.zeros(input_mask.shape, dtype=bool)
 
-        # Check vertical transitions (top to bottom)
-        vertical_transitions = (input_mask[1:, :] != input_mask[:-1, :]).astype(int)
-        transition_mask[1:, :] += vertical_transitions
-        transition_mask[:-1, :] += vertical_transitions
+        # Check horizontal transitions (left to right), marking both sides
+        horizontal_transitions = input_mask[:, 1:] != input_mask[:, :-1]
+        transition_mask[:, 1:] |= horizontal_transitions
+        transition_mask[:, :-1] |= horizontal_transitions
 
-        # Convert any non-zero values to 1
-        transition_mask = (transition_mask > 0).astype(int)
+        # Check vertical transitions (top to bottom), marking both sides
+        vertical_transitions = input_mask[1:, :] != input_mask[:-1, :]
+        transition_mask[1:, :] |= vertical_transitions
+        transition_mask[:-1, :] |= vertical_transitions
 
-        return transition_mask
+        # return as 0/1 values (without copying)
+        return transition_mask.view(np.uint8)
 
     def _get_object_mask(self) -> np.ndarray:
         """Returns the cached object mask. The mask is maintained by _update_cached_object_mask
@@ -152,23 +316,11 @@ class ObjectHandler:
         Returns:
             np.ndarray: Zone seperation mask
         """
-        # start with all 1s (e.g. all area is permitted)
-        zone_seperation_mask = np.ones(
-            (
-                self.terrain_handler.width,
-                self.terrain_handler.length,
-            )
-        )
-        # then check each zone (remove the zone from each)
-        for zone in self.zones:
-            zone_seperation_mask = self._update_mask_grid_with_radius(
-                zone_seperation_mask, zone.x, zone.z, extra_zone_spacing, set_to=0
-            )
-        return zone_seperation_mask
+        return self._get_incremental_zone_mask(extra_zone_spacing)
 
     def _get_all_zone_mask(self, exclude_zones: list[ZoneMarker] = []) -> np.ndarray:
-        """Returns the cached zone mask. The mask is not maintained by a cache and
-        is calculated each time from scratch
+        """Returns the zone mask. Without any excluded zones this is the cached
+        (incrementally updated) mask, otherwise it is calculated from scratch
 
         Args:
             exclude_zones (list[ZoneMarker], optional): Zones to exclude. Defaults to [].
@@ -176,12 +328,15 @@ class ObjectHandler:
         Returns:
             np.ndarray: Zone mask where 0 is occupied and 1 is free
         """
+        if not exclude_zones:
+            return self._get_incremental_zone_mask(None)
         # start with all 1s (e.g. all area is permitted)
         zone_mask = np.ones(
             (
                 self.terrain_handler.width,
                 self.terrain_handler.length,
-            )
+            ),
+            dtype=np.uint8,
         )
         # then check each zone (remove the zone from each)
         for zone in self.zones:
@@ -196,6 +351,43 @@ class ObjectHandler:
             )
         return zone_mask
 
+    def _get_incremental_zone_mask(self, radius: Union[int, None]) -> np.ndarray:
+        """Returns a mask where 0 is within radius of a zone and 1 is free. Zones
+        are only ever appended, so the mask is cached and only the zones added
+        since the last call are applied to it. The returned mask is read-only, as
+        it is shared between callers
+
+        Args:
+            radius (Union[int, None]): Radius to clear around each zone, or None to
+            use each zone's own radius
+
+        Returns:
+            np.ndarray: Zone mask where 0 is occupied and 1 is free
+        """
+        num_applied, zone_mask = self._zone_mask_cache.get(radius, (0, None))
+        if zone_mask is None:
+            # start with all 1s (e.g. all area is permitted)
+            zone_mask = np.ones(
+                (
+                    self.terrain_handler.width,
+                    self.terrain_handler.length,
+                ),
+                dtype=np.uint8,
+            )
+        if num_applied < len(self.zones):
+            zone_mask.flags.writeable = True
+            for zone in self.zones[num_applied:]:
+                self._update_mask_grid_with_radius(
+                    zone_mask,
+                    zone.x,
+                    zone.z,
+                    zone.radius if radius is None else radius,
+                    set_to=0,
+                )
+            zone_mask.flags.writeable = False
+        self._zone_mask_cache[radius] = (len(self.zones), zone_mask)
+        return zone_mask
+
     def _get_zone_mask_for_zone_objects(self, zone: ZoneMarker) -> np.ndarray:
         """Returns the zone mask based on the zone radius (for placing objects
         inside a zone)
@@ -224,7 +416,8 @@ class ObjectHandler:
             (
                 self.terrain_handler.width,
                 self.terrain_handler.length,
-            )
+            ),
+            dtype=np.uint8,
         )
         inclusion_mask = self._update_mask_grid_with_radius(
             inclusion_mask, x, z, radius, set_to=1
@@ -247,7 +440,8 @@ class ObjectHandler:
             (
                 self.terrain_handler.width,
                 self.terrain_handler.length,
-            )
+            ),
+            dtype=np.uint8,
         )
         exclusion_mask = self._update_mask_grid_with_radius(
             exclusion_mask, x, z, radius, set_to=0
@@ -265,28 +459,28 @@ class ObjectHandler:
         Returns:
             np.ndarray: Land mask
         """
-        # assume more water than land, so start with zeros
-        mask = np.zeros(
-            (
-                self.terrain_handler.width,
-                self.terrain_handler.length,
-            )
+        return self._get_cached_mask(
+            ("land", cutoff_height), lambda: self._build_land_mask(cutoff_height)
         )
-        # check each point against the raw terrain height
-        for x in range(self.terrain_handler.width):
-            for z in range(self.terrain_handler.length):
-                if self.terrain_handler.get_height(x, z) > cutoff_height:
-                    mask[x, z] = 1
+
+    def _build_land_mask(self, cutoff_height: float) -> np.ndarray:
+        """Builds the land mask (uncached, see _get_land_mask). A point is land if
+        it is above the cutoff height and not within 6 of the edge of the terrain
+
+        Args:
+            cutoff_height (float): Height above which is considered land
+
+        Returns:
+            np.ndarray: uint8 mask, 1 where land and 0 elsewhere
+        """
+        # check each point against the terrain height (read once for the whole map)
+        heights = self._get_heights()
+        mask = (heights > cutoff_height).astype(np.uint8)
         # setback everything radius 6 from the edge - to avoid things appearing
         # ... awkwardly on the edge of a cliff etc
-        binary_terrain = self.terrain_handler._get_height_2d_array().copy()
-        binary_terrain[binary_terrain < 0] = 0
-        binary_terrain[binary_terrain > 0] = 1
+        binary_terrain = heights > 0
         edge_mask = self._get_binary_transition_mask(binary_terrain)
-        for x in range(self.terrain_handler.width):
-            for z in range(self.terrain_handler.length):
-                if edge_mask[x, z] == 1:
-                    mask = self._update_mask_grid_with_radius(mask, x, z, 6, set_to=0)
+        mask[_dilate_with_disk(edge_mask, 6)] = 0
         return mask
 
     def _get_water_mask(self, cutoff_height=-20) -> np.ndarray:
@@ -294,24 +488,29 @@ class ObjectHandler:
         lookup. Is returned in the same dimensions as the terrain (e.g. LEV scale).
 
         Args:
-            cutoff_height (float, optional): Height above which is considered water.
-            Defaults to -20.
+            cutoff_height (float, optional): Height at or below which is considered
+            water. Defaults to -20.
 
         Returns:
             np.ndarray: Water mask
         """
-        # assume more water than land, so start with zeros
-        mask = np.zeros(
-            (
-                self.terrain_handler.width,
-                self.terrain_handler.length,
-            )
+        return self._get_cached_mask(
+            ("water", cutoff_height), lambda: self._build_water_mask(cutoff_height)
         )
-        # check each point against the raw terrain height
-        for x in range(self.terrain_handler.width):
-            for z in range(self.terrain_handler.length):
-                if self.terrain_handler.get_height(x, z) < cutoff_height:
-                    mask[x, z] = 1
+
+    def _build_water_mask(self, cutoff_height: float) -> np.ndarray:
+        """Builds the water mask (uncached, see _get_water_mask). A point is water
+        if it is at or below the cutoff height
+
+        Args:
+            cutoff_height (float): Height at or below which is considered water
+
+        Returns:
+            np.ndarray: uint8 mask, 1 where water and 0 elsewhere
+        """
+        # check each point against the terrain height (at or below is water)
+        heights = self._get_heights()
+        mask = (heights <= cutoff_height).astype(np.uint8)
         # dont add the special edge mask (to avoid putting sea objects on the land)
         return mask
 
@@ -327,31 +526,35 @@ class ObjectHandler:
         Returns:
             np.ndarray: Coast mask
         """
-        # assume more water than land, so start with zeros
-        mask = np.zeros(
-            (
-                self.terrain_handler.width,
-                self.terrain_handler.length,
-            )
+        return self._get_cached_mask(
+            ("coast", cutoff_height, radius),
+            lambda: self._build_coast_mask(cutoff_height, radius),
         )
 
+    def _build_coast_mask(self, cutoff_height: int, radius: int) -> np.ndarray:
+        """Builds the coast mask (uncached, see _get_coast_mask). A point is coast
+        if it is water and within radius of where the water meets the land
+
+        Args:
+            cutoff_height (int): Height at or below which is considered water
+            radius (int): Distance from the water's edge which is considered coast
+
+        Returns:
+            np.ndarray: uint8 mask, 1 where coast and 0 elsewhere
+        """
         # find edges where water meets land, by finding edges of a binary masked
         # ... terrain map
-        binary_terrain = self.terrain_handler._get_height_2d_array().copy()
+        binary_terrain = self._get_heights().copy()
         binary_terrain[binary_terrain < 0] = 0
         binary_terrain[binary_terrain > 0] = 1
         edge_mask = self._get_binary_transition_mask(binary_terrain)
 
-        # Only apply radius around points that are both edges and above cutoff height
-        for x in range(self.terrain_handler.width):
-            for z in range(self.terrain_handler.length):
-                if edge_mask[x, z] == 1:
-                    mask = self._update_mask_grid_with_radius(
-                        mask, x, z, radius, set_to=1
-                    )
+        # Apply the radius around every edge point in a single dilation
+        mask = _dilate_with_disk(edge_mask, radius)
         # now multiply this against the land mask - so we exclude land, giving us only
         # ... coast
-        return mask * self._get_water_mask(cutoff_height=cutoff_height)
+        mask &= self._get_water_mask(cutoff_height=cutoff_height) > 0
+        return mask.astype(np.uint8)
 
     def _find_location(
         self,
@@ -381,58 +584,119 @@ class ObjectHandler:
         Returns:
             tuple[float, float]: x,z location of the object
         """
-        # start with all 1s
-        mask = np.ones(
-            (
-                self.terrain_handler.width,
-                self.terrain_handler.length,
+        # the final mask only depends on the arguments, objects, zones and terrain
+        # ... so reuse it if none of those have changed since it was last built
+        # ... (extra masks are arbitrary arrays, so those are never cached)
+        cache_key = None
+        if extra_masks is None:
+            cache_key = (
+                where,
+                required_radius,
+                consider_objects,
+                consider_zones,
+                extra_zone_spacing,
+                None if in_zone is None else id(in_zone),
             )
-        )
+            versions = (
+                self._object_mask_version if consider_objects else None,
+                len(self.zones),
+                self.terrain_handler.revision,
+            )
+            cached = self._location_mask_cache.get(cache_key)
+            if cached is not None and cached[0] == versions:
+                mask = cached[1]
+            else:
+                mask = self._build_location_mask(
+                    where,
+                    required_radius,
+                    consider_objects,
+                    consider_zones,
+                    extra_zone_spacing,
+                    in_zone,
+                    extra_masks,
+                )
+                self._location_mask_cache[cache_key] = (versions, mask)
+        else:
+            mask = self._build_location_mask(
+                where,
+                required_radius,
+                consider_objects,
+                consider_zones,
+                extra_zone_spacing,
+                in_zone,
+                extra_masks,
+            )
+
+        # check if we have any non-zero values in the mask
+        if np.any(mask):
+            return self.noise_generator.select_random_entry_from_2d_array(mask)
+        logger.info("Find location: no suitable location found (empty mask)")
+        return None
+
+    def _build_location_mask(
+        self,
+        where: LocationEnum,
+        required_radius: float,
+        consider_objects: bool,
+        consider_zones: bool,
+        extra_zone_spacing: bool,
+        in_zone: ZoneMarker,
+        extra_masks: np.ndarray,
+    ) -> np.ndarray:
+        """Builds the mask of allowed locations for _find_location (see there for
+        the arguments)
+
+        Returns:
+            np.ndarray: Boolean mask, True where the object may be placed
+        """
+        # collect every mask which applies (non-zero = allowed)
+        masks = []
 
         # check if we have a zone to place the object in
         if in_zone is not None:
-            mask *= self._get_zone_mask_for_zone_objects(in_zone)
+            masks.append(self._get_zone_mask_for_zone_objects(in_zone))
 
         # get correct reference mask from where
         if where == LocationEnum.WATER:
-            mask *= self._get_water_mask()
+            masks.append(self._get_water_mask())
         elif where == LocationEnum.COAST:
-            mask *= self._get_coast_mask()
+            masks.append(self._get_coast_mask())
         else:
-            mask *= self._get_land_mask()
+            masks.append(self._get_land_mask())
 
         # apply that mask to the other masks specified in the argument
         if consider_objects:
-            mask *= self._get_object_mask()
+            masks.append(self._get_object_mask())
         if consider_zones and in_zone is None:
-            mask *= self._get_all_zone_mask()
+            masks.append(self._get_all_zone_mask())
         if extra_zone_spacing:
-            mask *= self._get_zone_seperation_mask(
-                extra_zone_spacing=extra_zone_spacing
+            masks.append(
+                self._get_zone_seperation_mask(extra_zone_spacing=extra_zone_spacing)
             )
         if extra_masks is not None:
-            mask *= extra_masks
+            masks.append(extra_masks)
+
+        # when placing in a zone, nothing outside the zone's bounding box (plus
+        # ... a 1 cell border, which may hold edges) can be allowed, so only that
+        # ... region needs combining and shrinking
+        shape = (self.terrain_handler.width, self.terrain_handler.length)
+        region = (slice(None), slice(None))
+        if in_zone is not None:
+            region = _nonzero_bounding_box(masks[0], border=1)
+        masks = [mask[region] for mask in masks]
+
+        # and combine them into a single boolean mask
+        region_mask = _and_masks(masks, masks[0].shape)
 
         # detect edges, and for each edge draw a circle of radius required_radius
         # ... (rounded up to closest int)
         required_radius = max(1, round(required_radius))
-        edge_mask = self._get_binary_transition_mask(mask)
-        for x in range(self.terrain_handler.width):
-            for z in range(self.terrain_handler.length):
-                if edge_mask[x, z] == 1:
-                    mask = self._update_mask_grid_with_radius(
-                        mask,
-                        x,
-                        z,
-                        required_radius // 2,
-                        set_to=0,  # mark as not allowed
-                    )
-
-        # check if we have any non-zero values in the edge mask
-        if np.any(mask):
-            return self.noise_generator.select_random_entry_from_2d_array(mask)
-        logger.info("Find location: no suitable location found (empty mask)")
-        return None
+        # ... in a single dilation of the edges (cells within it are not allowed)
+        edge_mask = self._get_binary_transition_mask(region_mask)
+        region_mask[_dilate_with_disk(edge_mask, required_radius // 2)] = 0
+        mask = np.zeros(shape, dtype=bool)
+        mask[region] = region_mask
+        return mask
 
     def add_carrier_and_return_mask(
         self, required_radius: int = 30, mask_radius: int = 70
@@ -478,19 +742,14 @@ class ObjectHandler:
             y_rotation=angle,
         )
         logger.info("ADD Carrier: Calculating mask...")
-        # start with array of 0s (assume radius is small)
-        mask = np.zeros(
-            (self.terrain_handler.width, self.terrain_handler.length), dtype=np.uint8
-        )
-        # then loop through and set 1 for locations within radius
-        for i in range(self.terrain_handler.width):
-            for j in range(self.terrain_handler.length):
-                # if inside the radius, set 1
-                if (i - x) ** 2 + (j - z) ** 2 <= mask_radius**2:
-                    mask[i, j] = 1
-                # if inside the object's required_radius, set 0 (avoid clash)
-                if (i - x) ** 2 + (j - z) ** 2 <= required_radius**2:
-                    mask[i, j] = 0
+        # set 1 for locations within the mask radius, but outside the carrier's
+        # ... required_radius (to avoid a clash), as a ring around the carrier
+        dx = np.arange(self.terrain_handler.width)[:, None] - x
+        dz = np.arange(self.terrain_handler.length)[None, :] - z
+        dist_sq = dx * dx + dz * dz
+        mask = (
+            (dist_sq <= mask_radius**2) & (dist_sq > required_radius**2)
+        ).astype(np.uint8)
         return mask
 
     def add_object_template_on_land_random(
@@ -524,7 +783,7 @@ class ObjectHandler:
             return
         x, z = returnval
         # find height at the specified x and z location (in LEV 3D space)
-        height = self.terrain_handler.get_height(x, z)
+        height = float(self._get_heights()[x, z])
         # check the height isnt negative, else its water so dont add
         reference_object_y_offset = ref_object.y_offset
         if height + reference_object_y_offset < 0:
@@ -606,7 +865,7 @@ class ObjectHandler:
             return
         x, z = returnval
         # find height at the specified x and z location (in LEV 3D space)
-        height = self.terrain_handler.get_height(x, z)
+        height = float(self._get_heights()[x, z])
         # check the height isnt negative, else its water so dont add
         if height + y_offset < 0:
             return
@@ -666,31 +925,95 @@ class ObjectHandler:
         """Adds a lot of random/different scenery objects to the level"""
         # TODO in future, switch below on map size - the below seems reasonable
         # ... for 'large' 256x256
-        objs = (
-            ["troprockcd"] * 8
-            + ["troprockbd"] * 7
-            + ["troprockad"] * 6
-            + ["troprockcw"] * 5
-            + ["troprockaw"] * 2
-            + ["palm1"] * 80
-            + ["plant1"] * 30
-            + ["palm2"] * 50
-            + ["palm3"] * 25
-            + ["rubblea"] * 5
-            + ["rubbleb"] * 5
-            + ["rubblec"] * 5
-            + ["rubbled"] * 5
-            + ["rubblee"] * 5
+        names, counts = zip(*SCENERY_OBJECTS)
+        objs = np.repeat(np.array(names, dtype=object), counts)
+        self._batch_place_on_land(
+            objs,
+            team=Team.NEUTRAL,
+            required_radius=2,
+            consider_zones=True,
         )
-        for obj in objs:
-            self.add_object_on_land_random(
-                obj,
-                team=Team.NEUTRAL,
-                required_radius=2,
-                consider_zones=True,
-            )
         logger.info(f"Done adding {len(objs)} scenery objects")
 
+    def _batch_place_on_land(
+        self,
+        object_types: list[str],
+        team: Union[int | Team] = Team.ENEMY,
+        required_radius: float = 1,
+        consider_zones: bool = False,
+    ) -> list[int]:
+        """Places many objects on land at random, one after another, giving the
+        same result as calling add_object_on_land_random for each in turn. The
+        allowed location mask is built once, then after each placement only the
+        window around the new object (the only area that can change) is rebuilt
+
+        Args:
+            object_types (list[str]): Types of the objects, in placement order
+            team (Union[int | Team], optional): Team number. Defaults to Team.ENEMY.
+            required_radius (float, optional): Keep-clear radius of each new object. Defaults to 1.
+            consider_zones (bool, optional): Whether to consider other zones. Defaults to False.
+
+        Returns:
+            list[int]: IDs of the objects which were placed
+        """
+        # land (and zones) do not change while placing, only the object mask does
+        static_mask = self._get_land_mask() > 0
+        if consider_zones:
+            static_mask = static_mask & (self._get_all_zone_mask() > 0)
+        # same radii as _find_location (edge shrink) and add_object_on_land_random
+        shrink_radius = max(1, round(required_radius)) // 2
+        stamp_radius = int(required_radius)
+
+        def _allowed(x_slice: slice, z_slice: slice) -> np.ndarray:
+            # allowed locations within a region, shrunk away from the edges
+            mask = static_mask[x_slice, z_slice] & (
+                self._cached_object_mask[x_slice, z_slice] > 0
+            )
+            edge_mask = self._get_binary_transition_mask(mask)
+            mask[_dilate_with_disk(edge_mask, shrink_radius)] = False
+            return mask
+
+        width, length = self.terrain_handler.width, self.terrain_handler.length
+        allowed = _allowed(slice(None), slice(None))
+        # a new object can change the allowed mask up to this far away (its
+        # ... radius, plus the edge next to it, plus the edge shrink) ...
+        window = stamp_radius + 1 + shrink_radius
+        # ... and rebuilding it there needs this much context around the window
+        context = shrink_radius + 1
+
+        team = team.value if isinstance(team, Team) else team
+        heights = self._get_heights()
+        object_ids = []
+        for object_type in object_types:
+            if not np.any(allowed):
+                logger.info("Batch place: no suitable location found (empty mask)")
+                break
+            x, z = self.noise_generator.select_random_entry_from_2d_array(allowed)
+            # find height at the specified x and z location (in LEV 3D space)
+            height = float(heights[x, z])
+            # check the height isnt negative, else its water so dont add
+            if height < 0:
+                continue
+            # Update the cached object mask before adding the object
+            self._update_cached_object_mask(x, z, stamp_radius)
+            object_ids.append(
+                self.ob3_interface.add_object(
+                    object_type=object_type,
+                    location=np.array([x, height, z]),
+                    team=team,
+                )
+            )
+            # rebuild the allowed mask in the window around the new object
+            x_lo, x_hi = max(0, x - window), min(width, x + window + 1)
+            z_lo, z_hi = max(0, z - window), min(length, z + window + 1)
+            cx_lo, cx_hi = max(0, x_lo - context), min(width, x_hi + context)
+            cz_lo, cz_hi = max(0, z_lo - context), min(length, z_hi + context)
+            region = _allowed(slice(cx_lo, cx_hi), slice(cz_lo, cz_hi))
+            allowed[x_lo:x_hi, z_lo:z_hi] = region[
+                x_lo - cx_lo : x_hi - cx_lo, z_lo - cz_lo : z_hi - cz_lo
+            ]
+        return object_ids
+
     def add_zone(
         self,
         zone_manager: "ZoneManager",
@@ -749,35 +1072,45 @@ class ObjectHandler:
             # If we couldn't place it, try a smaller size
             if current_size > ZoneSize.TINY:
                 logger.info(
-                    f"Could not find location for zone {zone_type} {current_size} {zone_subtype}, trying smaller size"
+                    "Could not find location for zone %s %s %s, trying smaller size",
+                    zone_type,
+                    current_size,
+                    zone_subtype,
                 )
-                current_size = ZoneSize(current_size - 1)
+                current_size = _SMALLER_ZONE_SIZE[current_size]
             else:
                 # We've tried the smallest size and still couldn't place it
                 break
 
         logger.info(
-            f"Could not find location for zone {zone_type} {zone_size} {zone_subtype} even at smallest size"
+            "Could not find location for zone %s %s %s even at smallest size",
+            zone_type,
+            zone_size,
+            zone_subtype,
         )
         return None
 
-    def create_patrol_points(self, n_points: int = 3) -> None:
+    def create_patrol_points(self, n_points: int = 3) -> np.ndarray:
         """Generates a patrol of n_points
 
         Args:
             n_points (int): Number of patrol points to use
+
+        Returns:
+            np.ndarray: (n_points, 3) array of x, y, z patrol point coordinates
         """
-        # select n_points at random using noisegen from the map coords
-        points = []
-        for _ in range(n_points):
-            x, z = self.noise_generator.select_random_entry_from_2d_array(
-                self._get_land_mask()
-            )
-            y = self.terrain_handler.get_height(x, z) + self.noise_generator.randint(
-                55, 100
-            )
-            points.append((x, y, z))
-        return points
+        # select n_points at random from the land cells in a single draw
+        # ... (the land mask does not change between points, so build it once)
+        land_mask = self._get_land_mask()
+        land_indices = np.flatnonzero(land_mask)
+        picks = self.noise_generator.rng.choice(
+            land_indices, size=n_points, replace=land_indices.size < n_points
+        )
+        xs, zs = np.unravel_index(picks, land_mask.shape)
+        ys = self.terrain_handler.get_heights(
+            xs, zs
+        ) + self.noise_generator.integers(55, 100, size=n_points)
+        return np.column_stack((xs, ys, zs)).astype(float)
 
     def add_object_at_coords(
         self, object_type: str, x: float, z: float, team: Team = Team.NEUTRAL
@@ -3,13 +3,16 @@ HWAE (Hostile Waters Antaeus Eternal)
 
 paths.py
 
-Handles path resolution for both development and PyInstaller environments
+Handles path resolution for both development and PyInstaller environments. Paths
+are resolved once and then cached, as they cannot change while running
 """
 
 import sys
+from functools import cache
 from pathlib import Path
 
 
+@cache
 def get_base_path() -> Path:
     """
     Returns the base path for the application, handling both development and PyInstaller environments.
@@ -26,6 +29,7 @@ def get_base_path() -> Path:
         return Path(__file__).resolve().parent.parent
 
 
+@cache
 def get_assets_path() -> Path:
     """
     Returns the path to the assets directory
@@ -41,6 +45,7 @@ def get_assets_path() -> Path:
         return Path(__file__).resolve().parent / "assets"
 
 
+@cache
 def get_templates_path() -> Path:
     """
     Returns the path to the templates directory
@@ -51,6 +56,7 @@ def get_templates_path() -> Path:
     return get_assets_path() / "templates"
 
 
+@cache
 def get_textures_path() -> Path:
     """
     Returns the path to the textures directory
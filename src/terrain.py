@@ -7,6 +7,8 @@ Contains all info regarding terrain for the level
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
+import math
 from logger import get_logger
 from paths import get_assets_path
 
@@ -20,6 +22,110 @@ from fileio.ob3 import MAP_SCALER
 from noisegen import NoiseGenerator
 from zones.base_zone import Zone
 
+# terrain point flags (see Step 5 of set_terrain_from_noise)
+TP_WET = 0x01
+TP_DRAW = 0x02
+TP_SHOREPOINT = 0x04
+TP_DRYPOINT = 0x08
+TP_WETPOINT = 0x10
+
+# noise thresholds for the random terrain textures (see Step 6 of
+# ... set_terrain_from_noise), each range is smaller than the previous so that
+# ... higher values get exponentially less space
+TEXTURE_NOISE_THRESHOLDS = np.array([0.4, 0.65, 0.8, 0.9, 0.95, 1.0])
+
+
+@lru_cache(maxsize=None)
+def _count_mapgen_templates() -> int:
+    """Returns the number of island templates in the mapgen assets folder (only
+    listed once per run)
+
+    Returns:
+        int: Number of mapgen templates
+    """
+    return len(list((get_assets_path() / "mapgen").glob("*.png")))
+
+
+@lru_cache(maxsize=None)
+def _load_mapgen_template(template_index: int) -> Image.Image:
+    """Loads an island template as a floating point ("F" mode) image normalised to
+    [0,1] (only decoded once per run). Callers must not modify it in place
+
+    Args:
+        template_index (int): Index of the template, e.g. 1 for 1.png
+
+    Returns:
+        Image.Image: The template image
+    """
+    with Image.open(get_assets_path() / "mapgen" / f"{template_index}.png") as fimg:
+        return fimg.convert("L").point(lambda value: value / 255, "F")
+
+
+def _rotate_and_resize(img: Image.Image, angle: float, size: tuple) -> Image.Image:
+    """Rotates an image by angle (expanding to fit the whole rotated image, like
+    Image.rotate with expand=True) and resizes it to size, in a single affine
+    transform rather than building the expanded image first
+
+    Args:
+        img (Image.Image): Image to rotate
+        angle (float): Angle to rotate by, in degrees counter clockwise
+        size (tuple): (width, height) of the returned image
+
+    Returns:
+        Image.Image: The rotated and resized image
+    """
+    width, height = img.size
+    centre_x, centre_z = width / 2.0, height / 2.0
+    # rotation matrix (output to input, same as Image.rotate)
+    angle_rad = -math.radians(angle % 360)
+    a, b = round(math.cos(angle_rad), 15), round(math.sin(angle_rad), 15)
+    d, e = round(-math.sin(angle_rad), 15), round(math.cos(angle_rad), 15)
+    # find the size of the expanded image, from where the corners rotate to
+    corners = [(0, 0), (width, 0), (width, height), (0, height)]
+    rotated_x = [a * (x - centre_x) + b * (z - centre_z) for x, z in corners]
+    rotated_z = [d * (x - centre_x) + e * (z - centre_z) for x, z in corners]
+    expanded_width = math.ceil(max(rotated_x)) - math.floor(min(rotated_x))
+    expanded_height = math.ceil(max(rotated_z)) - math.floor(min(rotated_z))
+    # scale output pixels to the expanded image, then rotate about its centre
+    # ... back into the input image
+    scale_x, scale_z = expanded_width / size[0], expanded_height / size[1]
+    offset_x, offset_z = -expanded_width / 2.0, -expanded_height / 2.0
+    matrix = (
+        a * scale_x,
+        b * scale_z,
+        a * offset_x + b * offset_z + centre_x,
+        d * scale_x,
+        e * scale_z,
+        d * offset_x + e * offset_z + centre_z,
+    )
+    return img.transform(size, Image.AFFINE, matrix, Image.BILINEAR)
+
+
+def _manhattan_distance_to(mask: np.ndarray, max_distance: int) -> np.ndarray:
+    """Returns the Manhattan distance from every point to the nearest True point in
+    mask, by growing the mask one step (4-neighbour) at a time
+
+    Args:
+        mask (np.ndarray): Boolean mask of the points to measure distance from
+        max_distance (int): Distance to stop growing at
+
+    Returns:
+        np.ndarray: Distances, with max_distance + 1 for any point further away
+    """
+    distance = np.full(mask.shape, max_distance + 1, dtype=np.int32)
+    distance[mask] = 0
+    reached = mask.copy()
+    for step in range(1, max_distance + 1):
+        grown = reached.copy()
+        grown[1:, :] |= reached[:-1, :]
+        grown[:-1, :] |= reached[1:, :]
+        grown[:, 1:] |= reached[:, :-1]
+        grown[:, :-1] |= reached[:, 1:]
+        distance[grown & ~reached] = step
+        reached = grown
+    return distance
+
+
 @dataclass
 class TerrainHandler:
     """Class for handling the terrain of the level"""
@@ -32,38 +138,84 @@ class TerrainHandler:
         self.width = self.lev_interface.header.width
         self.length = self.lev_interface.header.length
 
-        # load the 1 dimensional array of terrain points from the file
-        # ... and convert it into a 2d numpy array
-        self.terrain_points = np.array(self.lev_interface.terrain_points).reshape(
-            (self.width, self.length)
-        )
+        # copy each field we edit out of the 1 dimensional (structured) array of
+        # ... terrain points into its own contiguous 2d numpy array (structure of
+        # ... arrays), so each step works on whole arrays of a single field. These
+        # ... are written back by write_to_lev
+        shape = (self.width, self.length)
+        points = self.lev_interface.terrain_points
+        self.heights = np.ascontiguousarray(points["height"]).reshape(shape)
+        self.mats = np.ascontiguousarray(points["mat"]).reshape(shape)
+        self.flags = np.ascontiguousarray(points["flags"]).reshape(shape)
+        self.texture_dirs = np.ascontiguousarray(points["texture_dir"]).reshape(shape)
+        # combined mask of a set of zones, keyed by the zones it was built from
+        self._all_zones_mask_cache: tuple[tuple[int, ...], np.ndarray] = ((), None)
+        # bumped whenever heights change, so height derived data (e.g. land masks)
+        # ... can tell whether it needs rebuilding
+        self.revision = 0
+
+    def write_to_lev(self) -> None:
+        """Writes the terrain arrays (heights, materials, flags and texture
+        directions) back into the LEV file's terrain points, ready for saving
+        """
+        points = self.lev_interface.terrain_points
+        points["height"] = self.heights.ravel()
+        points["mat"] = self.mats.ravel()
+        points["flags"] = self.flags.ravel()
+        points["texture_dir"] = self.texture_dirs.ravel()
+
+    def _get_all_zones_mask(self, zones: list[Zone]) -> np.ndarray:
+        """Returns the combined mask of all the given zones, only rebuilding it
+        when the zones change (it is shared between calls, so must not be modified)
+
+        Args:
+            zones (list[Zone]): Zones to combine
+
+        Returns:
+            np.ndarray: Boolean mask, True inside any of the zones
+        """
+        zone_ids = tuple(id(zone) for zone in zones)
+        cached_ids, all_zones_mask = self._all_zones_mask_cache
+        if all_zones_mask is None or cached_ids != zone_ids:
+            all_zones_mask = np.zeros((self.width, self.length), dtype=bool)
+            for zone in zones:
+                region = zone.mask_region()
+                all_zones_mask[region] |= zone.mask()[region]
+            self._all_zones_mask_cache = (zone_ids, all_zones_mask)
+        return all_zones_mask
 
     def get_raw_height(self, x: int, z: int) -> float:
-        return self.terrain_points[x, z].height
+        return float(self.heights[x, z])
 
     def get_height(self, x: int, z: int) -> float:
-        return self.terrain_points[x, z].height / MAP_SCALER
+        return float(self.heights[x, z]) / MAP_SCALER
+
+    def get_heights(self, xs: np.ndarray, zs: np.ndarray) -> np.ndarray:
+        """Returns the heights at many (x, z) locations in one call
+
+        Args:
+            xs (np.ndarray): X coordinates
+            zs (np.ndarray): Z coordinates (same length as xs)
+
+        Returns:
+            np.ndarray: Heights at each location (in LEV 3D space)
+        """
+        heights = self.heights[np.asarray(xs), np.asarray(zs)]
+        return heights.astype(float) / MAP_SCALER
 
     def _get_height_2d_array(self) -> np.ndarray:
-        return np.array(
-            [
-                [point.height / MAP_SCALER for point in row]
-                for row in self.terrain_points
-            ]
-        )
+        # divide straight into a float64 result, rather than upcasting a copy first
+        return np.divide(self.heights, MAP_SCALER, dtype=np.float64)
 
     def set_height(self, x: int, z: int, height: float) -> None:
-        self.terrain_points[x, z].height = height
+        self.heights[x, z] = height
+        self.revision += 1
 
     def get_max_height(self) -> float:
-        return np.max(
-            np.array([[point.height for point in row] for row in self.terrain_points])
-        )
+        return float(self.heights.max())
 
     def get_min_height(self) -> float:
-        return np.min(
-            np.array([[point.height for point in row] for row in self.terrain_points])
-        )
+        return float(self.heights.min())
 
     def _scale_array(
         self, arr: np.ndarray, min_val: float, max_val: float
@@ -71,41 +223,34 @@ class TerrainHandler:
         """
         Scales a 2D NumPy array to a specified range while maintaining the original distribution.
 
-        This function scales the heights of the _LevTerrainPoint objects in the input array
-        to the specified range while maintaining the original distribution. This is done by
-        first finding the current min and max values of the heights, and then scaling the heights
+        This function scales the heights in the input array to the specified range
+        while maintaining the original distribution. This is done by first finding
+        the current min and max values of the heights, and then scaling the heights
         to the specified range using a linear transformation.
 
         Args:
-            arr (np.ndarray): The 2D NumPy array of _LevTerrainPoint objects
+            arr (np.ndarray): The 2D NumPy array of heights
             min_val (float): The desired minimum value after scaling
             max_val (float): The desired maximum value after scaling
 
         Returns:
             np.ndarray: The original array with heights scaled to the new range
         """
-        # Extract heights into a new array
-        heights = np.array([[point.height for point in row] for row in arr])
-
         # Get the actual min/max values from the heights
-        current_min = np.min(heights)
-        current_max = np.max(heights)
+        current_min = np.min(arr)
+        current_max = np.max(arr)
 
         # Avoid division by zero if array is constant
         if current_max == current_min:
             # Set all heights to min_val
-            for row in arr:
-                for point in row:
-                    point.height = min_val
+            arr[...] = min_val
             return arr
 
-        # Scale the heights
+        # Scale the heights in place (no temporary arrays)
         scale_factor = (max_val - min_val) / (current_max - current_min)
-        for x in range(arr.shape[0]):
-            for y in range(arr.shape[1]):
-                arr[x, y].height = (
-                    min_val + (heights[x, y] - current_min) * scale_factor
-                )
+        arr -= current_min
+        arr *= scale_factor
+        arr += min_val
 
         return arr
 
@@ -120,107 +265,95 @@ class TerrainHandler:
         logger.info("Step 1: Generating base noise map...")
         # generate a base noise map with the same dimensions as the map
         noise_map = self.noise_gen.random_noisemap(self.width, self.length, cutoff=0.3)
-        for x in range(self.width):
-            for y in range(self.length):
-                self.terrain_points[x, y].height = noise_map[x, y]
+        self.heights[:] = noise_map
 
         # Step 2 - load a template map outline, to enforce we get an island
         logger.info("Step 2: Applying island template...")
-        # TODO neater
-        mapgen_dir = get_assets_path() / "mapgen"
-        mapgen_files = list(mapgen_dir.glob("*.png"))
-        num_mapgen_templates = len(mapgen_files)
         # pick a mapgen template at random
-        mapgen_template = self.noise_gen.randint(1, num_mapgen_templates - 1)
+        mapgen_template = self.noise_gen.randint(1, _count_mapgen_templates() - 1)
         logger.info(f"Selected template: {mapgen_template}.png")
-        with Image.open(mapgen_dir / f"{mapgen_template}.png") as fimg:
-            # rotate by a random angle
-            angle = self.noise_gen.randint(0, 360)
-            logger.info(f"Rotating template by {angle} degrees")
-            img = fimg.rotate(angle, Image.NEAREST, expand=True)
-            # normlaise to [0,1]
-            img = img.convert("L")
-            img = np.array(img) / 255
-            # resize to match world
-            img = np.array(Image.fromarray(img).resize(self.terrain_points.shape))
-            # now apply this as a multiplicative mask to the base map (as they are
-            # ... the same dimensions now)
-            for x in range(self.width):
-                for y in range(self.length):
-                    self.terrain_points[x, y].height *= img[x, y]
+        # load the template (already normalised to [0,1])
+        img = _load_mapgen_template(mapgen_template)
+        # rotate by a random angle, and resize to match world
+        angle = self.noise_gen.randint(0, 360)
+        logger.info(f"Rotating template by {angle} degrees")
+        img = np.array(_rotate_and_resize(img, angle, self.heights.shape))
+        # now apply this as a multiplicative mask to the base map (as they are
+        # ... the same dimensions now)
+        self.heights *= img
 
         # Step 3 - scale the terrain based on testing
         logger.info("Step 3: Scaling terrain heights...")
-        self.terrain_points = self._scale_array(self.terrain_points, -1000, 3200)
+        self.heights = self._scale_array(self.heights, -1000, 3200)
 
         # Step 4 - apply final cutoff (to remove underwater height changes)
         logger.info("Step 4: Applying underwater height cutoff...")
-        for x in range(self.width):
-            for y in range(self.length):
-                if self.terrain_points[x, y].height < -150:
-                    self.terrain_points[x, y].height = -1500
+        self.heights[self.heights < -150] = -1500
 
         # Step 5 - set flags for each point (texture directions and coast flags)
         logger.info("Step 5: Setting terrain flags...")
-        
-        # Define flag constants
-        TP_WET = 0x01
-        TP_DRAW = 0x02  
-        TP_SHOREPOINT = 0x04
-        TP_DRYPOINT = 0x08
-        TP_WETPOINT = 0x10
-        
+
         # Set base flags and wet/dry point flags for all points
-        for x in range(self.width):
-            for y in range(self.length):
-                height = self.terrain_points[x, y].height
-                # Base flags + wet/dry point flags
-                # Below values taken from experiementation with other .lev files
-                self.terrain_points[x, y].flags = (74 if height < 50 else 21) | (TP_WETPOINT if height < 0 else TP_DRYPOINT)
-                # set each texture a random direction (gives some visual variety)
-                self.terrain_points[x, y].texture_dir = self.noise_gen.randint(0, 8)
+        # Below values taken from experiementation with other .lev files
+        heights = self.heights
+        # (uint16 choices, so the flags are built in their final dtype without
+        # ... any int64 temporaries to cast down)
+        self.flags = np.where(heights < 50, np.uint16(74), np.uint16(21))
+        self.flags |= np.where(
+            heights < 0, np.uint16(TP_WETPOINT), np.uint16(TP_DRYPOINT)
+        )
+
+        # set each texture a random direction (gives some visual variety)
+        self.texture_dirs = self.noise_gen.integers(
+            0, 8, size=(self.width, self.length), dtype=np.uint8
+        )
         
-        # Set square flags (wet/draw/shore) for all squares except edges
-        for x in range(self.width - 1):
-            for y in range(self.length - 1):
-                point = self.terrain_points[x, y]
-                heights = [self.terrain_points[x+dx, y+dy].height for dx in [0,1] for dy in [0,1]]
-                
-                if any(h > -30.0 for h in heights): point.flags |= TP_DRAW
-                if any(h < 0.0 for h in heights): point.flags |= TP_WET
-                if point.flags & (TP_WET | TP_DRAW) == (TP_WET | TP_DRAW): point.flags |= TP_SHOREPOINT
+        # Set square flags (wet/draw/shore) for all squares except edges, where each
+        # ... square is a point and its +1 neighbours in x, z and both
+        corners = (
+            heights[:-1, :-1],
+            heights[1:, :-1],
+            heights[:-1, 1:],
+            heights[1:, 1:],
+        )
+        square_max = np.maximum.reduce(corners)
+        square_min = np.minimum.reduce(corners)
+        square_flags = self.flags[:-1, :-1]
+        square_flags[square_max > -30.0] |= TP_DRAW
+        square_flags[square_min < 0.0] |= TP_WET
+        square_flags[
+            square_flags & (TP_WET | TP_DRAW) == (TP_WET | TP_DRAW)
+        ] |= TP_SHOREPOINT
 
         # Step 6 - apply random map textures
         logger.info("Step 6: Applying terrain textures...")
         noise_map = self.noise_gen.random_noisemap(self.width, self.length)
         # Map noise values (0-1) to texture indices (0-N) with decreasing frequency
-        # Create thresholds that give exponentially less space to higher values
-        thresholds = np.array(
-            [0.4, 0.65, 0.8, 0.9, 0.95, 1.0]
-        )  # Each range is smaller than the previous
-        noise_map = np.digitize(noise_map, thresholds)
-
-        # Step 6b - apply the noisemap to the terrain (the terrain_points) with
-        # ... an offset to cover the sea and shore
-        logger.info("Applying base terrain textures...")
-        for x in range(self.width):
-            for y in range(self.length):
-                self.terrain_points[x, y].mat = noise_map[x, y] + 2
-
-        # Step 6c - apply height-bound materials (sea, shore)
-        logger.info("Applying height-based terrain textures...")
+        # (a right-sided search of the sorted thresholds, the same as np.digitize)
+        noise_map = np.searchsorted(
+            TEXTURE_NOISE_THRESHOLDS, noise_map, side="right"
+        ).astype(np.uint8)
+
+        # Step 6b - apply the noisemap to the terrain (the materials) with
+        # ... an offset to cover the sea and shore. Step 6c - apply height-bound
+        # ... materials (sea, shore, peaks, hills) over the top. Both are written in
+        # ... a single pass, with the noise materials as the fallback
+        logger.info("Applying base and height-based terrain textures...")
         max_height = self.get_max_height()
-        for x in range(self.width):
-            for y in range(self.length):
-                if self.terrain_points[x, y].height < -10:
-                    self.terrain_points[x, y].mat = 0  # sea
-                elif -10 <= self.terrain_points[x, y].height <= 80:
-                    self.terrain_points[x, y].mat = 1  # shore
-                elif self.terrain_points[x, y].height > 0.8 * max_height:
-                    self.terrain_points[x, y].mat = 5  # hills
-                elif self.terrain_points[x, y].height > 0.9 * max_height:
-                    self.terrain_points[x, y].mat = 6  # peaks
+        heights = self.heights
+        # first matching condition wins, so peaks must be checked before hills
+        self.mats = np.select(
+            [
+                heights < -10,  # sea
+                heights <= 80,  # shore
+                heights > 0.9 * max_height,  # peaks
+                heights > 0.8 * max_height,  # hills
+            ],
+            np.array([0, 1, 6, 5], dtype=np.uint8),
+            default=noise_map + 2,
+        )
 
+        self.revision += 1
         logger.info("Terrain generation complete!")
 
     def apply_texture_based_on_zone(self, zone: Zone) -> None:
@@ -232,15 +365,13 @@ class TerrainHandler:
         """
         # first select all the terrain points which are within the zone's mask
         logger.info("Applying zone texture: Selecting terrain points mask")
-        zone_mask = zone.mask()
-        for x in range(self.width):
-            for y in range(self.length):
-                if zone_mask[x, y]:
-                    # slight chance to use a different texture
-                    texture_offset = self.noise_gen.select_random_from_list(
-                        [0] * 5 + [1] + [2]
-                    )
-                    self.terrain_points[x, y].mat = zone.texture_id + texture_offset
+        # (only the region the zone covers, the rest of its mask is empty)
+        region = zone.mask_region()
+        inside = zone.mask()[region]
+        # slight chance to use a different texture (drawn for every point at once)
+        texture_offsets = np.array([0] * 5 + [1] + [2], dtype=np.uint8)
+        picks = self.noise_gen.integers(0, len(texture_offsets), size=inside.sum())
+        self.mats[region][inside] = zone.texture_id + texture_offsets[picks]
         logger.info("Applying zone texture: Completed")
 
     def flatten_terrain_based_on_zone(
@@ -253,73 +384,58 @@ class TerrainHandler:
             zone (Zone): Zone object defining the mask
             smooth_radius (int): Radius of smoothing area outside the zone
         """
-        zone_mask = zone.mask()
+        # only work on the zone's region, grown by enough to cover the falloff (as
+        # ... nothing outside of that can change)
+        x_region, z_region = zone.mask_region()
+        margin = smooth_radius + 1
+        window = (
+            slice(
+                max(0, x_region.start - margin), min(self.width, x_region.stop + margin)
+            ),
+            slice(
+                max(0, z_region.start - margin), min(self.length, z_region.stop + margin)
+            ),
+        )
+        inside = zone.mask()[window]
+        heights = self.heights[window]
 
         # Get the zone's average height
+        zone_heights = np.maximum(heights[inside], 60)
         avg_height = 0
-        count = 0
-        for x in range(self.width):
-            for y in range(self.length):
-                if zone_mask[x, y]:
-                    avg_height += max(60, self.terrain_points[x, y].height)
-                    count += 1
-
-        if count > 0:
-            avg_height /= count
+        if zone_heights.size > 0:
+            avg_height = float(zone_heights.mean(dtype=np.float64))
 
         # Set min height - to avoid spawning things in water
         avg_height = max(avg_height, 60)
 
         # Set all points inside the zone to the average height
-        for x in range(self.width):
-            for y in range(self.length):
-                if zone_mask[x, y]:
-                    self.terrain_points[x, y].height = avg_height
+        heights[inside] = avg_height
 
         # Simple linear falloff around the zone
-        # First identify the boundary points of the zone
-        boundary_points = []
-        for x in range(self.width):
-            for y in range(self.length):
-                if zone_mask[x, y]:
-                    # Check if this is a boundary point (has at least one non-zone neighbor)
-                    if ((x > 0 and not zone_mask[x-1, y]) or
-                        (x < self.width-1 and not zone_mask[x+1, y]) or
-                        (y > 0 and not zone_mask[x, y-1]) or
-                        (y < self.length-1 and not zone_mask[x, y+1])):
-                        boundary_points.append((x, y))
+        # First identify the boundary points of the zone (zone points with at
+        # ... least one non-zone neighbour)
+        outside_neighbour = np.zeros_like(inside)
+        outside_neighbour[1:, :] |= ~inside[:-1, :]
+        outside_neighbour[:-1, :] |= ~inside[1:, :]
+        outside_neighbour[:, 1:] |= ~inside[:, :-1]
+        outside_neighbour[:, :-1] |= ~inside[:, 1:]
+        boundary = inside & outside_neighbour
 
         # issue 6 - get a mask of all existing zones and dont smooth
         # ... if the point is inside any other zones' mask (to prevent
         # .... smoothing an adjacent zone). This includes this zone
-        all_zones_mask = np.zeros((self.width, self.length))
-        for other_zone in all_existing_zones:
-            all_zones_mask += other_zone.mask()
-
-        # Apply falloff to points outside the zone
-        for x in range(self.width):
-            for y in range(self.length):
-                # Skip points inside any existing zone
-                if all_zones_mask[x, y]:
-                    continue
-                
-                # Find minimum distance to any boundary point
-                min_dist = smooth_radius + 1
-                for bx, by in boundary_points:
-                    # Use Manhattan distance for simplicity
-                    dist = abs(x - bx) + abs(y - by)
-                    if dist < min_dist:
-                        min_dist = dist
-                
-                # Apply falloff if within smooth_radius
-                if min_dist <= smooth_radius:
-                    # Linear falloff factor
-                    falloff = 1.0 - (min_dist / smooth_radius)
-                    
-                    # Apply linear interpolation
-                    original_height = self.terrain_points[x, y].height
-                    self.terrain_points[x, y].height = (
-                        falloff * avg_height + (1 - falloff) * original_height
-                    )
-        
+        all_zones_mask = self._get_all_zones_mask(all_existing_zones)[window]
+
+        # Apply falloff to points outside any zone, within smooth_radius (Manhattan
+        # ... distance) of the boundary
+        min_dist = _manhattan_distance_to(boundary, smooth_radius)
+        falloff_mask = (min_dist <= smooth_radius) & ~all_zones_mask
+        # Linear falloff factor (kept float32, like the heights), then linear
+        # ... interpolation to the zone height
+        falloff = 1 - min_dist[falloff_mask].astype(np.float32) / smooth_radius
+        heights[falloff_mask] = (
+            falloff * avg_height + (1 - falloff) * heights[falloff_mask]
+        )
+
+        self.revision += 1
         logger.info(f"Zone: Flattening terrain: Set zone to height {avg_height} with simple linear falloff")
@@ -16,6 +16,42 @@ import shutil
 from pathlib import Path
 
 
+def _ignore_non_texture_files(folder: str, names: list[str]) -> list[str]:
+    """Ignore predicate for shutil.copytree, skipping everything but .pcx files
+
+    Args:
+        folder (str): Folder being copied (unused)
+        names (list[str]): Names of the entries in the folder
+
+    Returns:
+        list[str]: Names which should not be copied
+    """
+    return [name for name in names if not name.endswith(".pcx")]
+
+
+def _hardlink_or_copy(src: str, dst: str) -> str:
+    """Copy function for shutil.copytree, which hardlinks the texture into place
+    (as the textures are never modified, so the same data doesnt need to be
+    duplicated for every generated map). Falls back to a normal copy where a link
+    cant be made (e.g. a different drive, or a filesystem without hardlinks)
+
+    Args:
+        src (str): Path of the file to copy
+        dst (str): Path to copy the file to
+
+    Returns:
+        str: The destination path
+    """
+    try:
+        # ... replacing any texture left from a previous map
+        if os.path.lexists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
 def select_map_texture_group(
     path_to_textures: Path,
     cfg: CfgFile,
@@ -52,5 +88,6 @@ def select_map_texture_group(
         path_to_textures / f"{folders[folder_idx]}",
         paste_textures_path,
         dirs_exist_ok=True,
-        ignore=lambda x, y: [f for f in y if not f.endswith(".pcx")],
+        ignore=_ignore_non_texture_files,
+        copy_function=_hardlink_or_copy,
     )
@@ -7,15 +7,18 @@ Contains the UI for the map generator
 """
 
 # python imports
+import base64
+from functools import cache
 import tkinter as tk
 from tkinter import ttk
 import tkinter.filedialog as filedialog
 import tkinter.messagebox as messagebox
+import json
+import queue
 import threading
 import traceback
 import webbrowser
 from pathlib import Path
-import sv_ttk
 
 # local imports
 from constants import VERSION_STR, PROGRESS_STEPS, NEW_LEVEL_NAME
@@ -25,6 +28,24 @@ from paths import get_assets_path
 
 logger = get_logger()
 
+# last folder each file dialog was opened in (kept between runs)
+DIALOG_DIRS_PATH = Path.home() / ".hwae" / "dialog_dirs.json"
+
+# how often (ms) the main thread checks for progress from the generation thread
+PROGRESS_POLL_MS = 50
+
+
+@cache
+def _load_cover_image_data() -> bytes:
+    """Read the cover image once, as base64 data ready for tk.PhotoImage (the
+    PhotoImage itself belongs to a single Tk root, so cant be shared between
+    windows)
+
+    Returns:
+        bytes: Base64 encoded PNG data of the cover image
+    """
+    return base64.b64encode((get_assets_path() / "hwar_cover.png").read_bytes())
+
 
 class GUI:
     """GUI for generating maps"""
@@ -33,7 +54,13 @@ class GUI:
         """Initialize the UI"""
         # create root and set theme
         self.root = tk.Tk()
-        sv_ttk.set_theme(root=self.root, theme="light")
+        try:
+            # imported here, as it is only needed once a window is created
+            import sv_ttk
+
+            sv_ttk.set_theme(root=self.root, theme="light")
+        except ImportError:
+            logger.warning("sv_ttk is not installed, using the default theme")
         self.root.title(f"Hostile Waters: Antaeus Eternal")
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.root.resizable(False, False)
@@ -49,6 +76,10 @@ class GUI:
         self.current_progress_step = 0
         self.total_progress_steps = PROGRESS_STEPS
         self.error_message = ""
+        self._last_dirs = self._load_last_dirs()
+        # messages from the generation thread, which can only be handled on the
+        # ... main thread (as tk is not thread safe)
+        self._progress_q = queue.Queue()
 
         # Create UI elements
         content_frame = ttk.Frame(self.main_frame)
@@ -106,9 +137,14 @@ class GUI:
 
         # Add image directly to the right column
         self.image_label = ttk.Label(right_column)
-        img = tk.PhotoImage(file=str(get_assets_path() / "hwar_cover.png"))
-        self.image_label.config(image=img)
-        self.image_label.image = img  # Keep a reference to prevent garbage collection
+        try:
+            img = tk.PhotoImage(data=_load_cover_image_data())
+            self.image_label.config(image=img)
+            # Keep a reference to prevent garbage collection
+            self.image_label.image = img
+        except (OSError, tk.TclError) as e:
+            # the cover is only decoration, so carry on without it
+            logger.warning(f"Could not load the cover image: {str(e)}")
         self.image_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         # Progress bar at the bottom
@@ -121,6 +157,9 @@ class GUI:
         self.status_label = ttk.Label(self.main_frame, text="")
         self.status_label.pack(fill=tk.X, side=tk.BOTTOM, pady=(5, 0))
 
+        # start checking for progress once the main loop is running
+        self.root.after_idle(self._pump_progress)
+
     def _select_hwar_executable(self):
         """Open file dialog to select HostileWaters.exe"""
         exe_path = filedialog.askopenfilename(
@@ -129,9 +168,11 @@ class GUI:
                 ("Hostile Waters Executable", "HostileWaters.exe"),
                 ("All files", "*.*"),
             ],
+            initialdir=self._last_dirs.get("exe", str(Path.home())),
         )
 
         if exe_path:
+            self._save_last_dir("exe", exe_path)
             # Set the hwar_folder to the parent folder of the executable
             self.hwar_folder = Path(exe_path).parent
 
@@ -149,10 +190,43 @@ class GUI:
         file_path = filedialog.askopenfilename(
             title="Select JSON Configuration File",
             filetypes=[("JSON files", "*.json")],
+            initialdir=self._last_dirs.get("json", str(Path.home())),
         )
         if file_path:
+            self._save_last_dir("json", file_path)
             self._start_map_generation(file_path)
 
+    def _load_last_dirs(self) -> dict[str, str]:
+        """Load the last folder used by each file dialog
+
+        Returns:
+            dict[str, str]: Last folder for each dialog (empty if none were saved)
+        """
+        try:
+            with open(DIALOG_DIRS_PATH, "r") as f:
+                last_dirs = json.load(f)
+        except (OSError, ValueError):
+            # no saved folders yet (or the file is unreadable), so start fresh
+            return {}
+        return last_dirs if isinstance(last_dirs, dict) else {}
+
+    def _save_last_dir(self, dialog: str, selected_path: str):
+        """Remember the folder a file was selected from, for the next time the
+        same dialog is opened
+
+        Args:
+            dialog (str): Name of the dialog ("exe" or "json")
+            selected_path (str): Path of the file selected in the dialog
+        """
+        self._last_dirs[dialog] = str(Path(selected_path).parent)
+        try:
+            DIALOG_DIRS_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(DIALOG_DIRS_PATH, "w") as f:
+                json.dump(self._last_dirs, f)
+        except OSError as e:
+            # not critical, the dialog will just open in the default folder
+            logger.warning(f"Could not save the last dialog folder: {str(e)}")
+
     def _on_close(self):
         """Handle window close event"""
         if self.generation_in_progress:
@@ -197,8 +271,36 @@ class GUI:
 
     def flag_as_complete(self):
         """Flag the current generation as complete"""
-        # Schedule the UI update on the main thread
-        self.root.after(0, self._update_ui_after_completion)
+        # Pass to the main thread, which will update the UI
+        self._progress_q.put(("done", None))
+
+    def _pump_progress(self):
+        """Handle all messages posted by the generation thread (called from the
+        main thread), then check again after PROGRESS_POLL_MS. Any number of steps
+        posted since the last check are shown with a single progress update
+        """
+        latest_status = None
+        while True:
+            try:
+                message, value = self._progress_q.get_nowait()
+            except queue.Empty:
+                break
+            if message == "step":
+                self.current_progress_step += 1
+                latest_status = value
+            elif message == "done":
+                latest_status = None
+                self._update_ui_after_completion()
+            elif message == "error":
+                latest_status = None
+                self.error_message = value
+                self._show_error_and_reset()
+        if latest_status is not None:
+            progress_value = int(
+                (self.current_progress_step / self.total_progress_steps) * 100
+            )
+            self._update_progress(progress_value, latest_status)
+        self.root.after(PROGRESS_POLL_MS, self._pump_progress)
 
     def _update_ui_after_completion(self):
         """Update the UI after completion (called from the main thread)"""
@@ -229,9 +331,7 @@ class GUI:
             logger.error(traceback.format_exc())
 
             # Show error message on the main thread
-            # Use a direct function call instead of a lambda to avoid reference issues
-            self.error_message = str(e)
-            self.root.after(0, self._show_error_and_reset)
+            self._progress_q.put(("error", str(e)))
 
     def _show_error_and_reset(self):
         """Show error message and reset UI state"""
@@ -277,11 +377,8 @@ class GUI:
         Args:
             status_text (str): Text to display in the status label
         """
-        self.current_progress_step += 1
-        progress_value = int(
-            (self.current_progress_step / self.total_progress_steps) * 100
-        )
-        self.root.after(0, self._update_progress, progress_value, status_text)
+        # Pass to the main thread, which will update the progress bar
+        self._progress_q.put(("step", status_text))
 
     def _update_progress(self, value, status_text=""):
         """Update the progress bar value and status label
@@ -7,6 +7,7 @@ Contains all info regarding objects for the level
 """
 
 from dataclasses import dataclass
+import copy
 import numpy as np
 from logger import get_logger
 from typing import Union
@@ -78,6 +79,8 @@ ZONE_SUBTYPE_WEIGHTS = {
         ZoneSubType.FUEL_TANKS: 1,
     },
 }
+# NOTE - this is the starting allowance for every map, each ZoneManager counts
+# ... down its own copy
 ALLOWED_MAX_SUBTYPE_ZONES = {
     ZoneType.BASE: {
         ZoneSubType.GENERIC_BASE: 999,
@@ -97,6 +100,17 @@ PUMP_ZONES_PER_BASE_ZONE = {
     ZoneSize.XLARGE: [ZoneSize.SMALL, ZoneSize.SMALL],
 }
 
+ZONE_CLASSES = {
+    # SCRAP ZONES
+    (ZoneType.SCRAP, ZoneSubType.DESTROYED_BASE): DestroyedBaseZone,
+    (ZoneType.SCRAP, ZoneSubType.OLD_TANK_BATTLE): OldTankBattleZone,
+    (ZoneType.SCRAP, ZoneSubType.FUEL_TANKS): OilTankZone,
+    (ZoneType.SCRAP, ZoneSubType.WEAPON_CRATE): WeaponCrateZone,
+    # ENEMY ZONES
+    (ZoneType.BASE, ZoneSubType.GENERIC_BASE): GenericBaseZone,
+    (ZoneType.BASE, ZoneSubType.PUMP_OUTPOST): PumpOutpostZone,
+}
+
 
 @dataclass
 class ZoneManager:
@@ -104,9 +118,14 @@ class ZoneManager:
     noise_generator: NoiseGenerator
     zonegen_root: Path
     # NOTE - zones themselves live in object manager
-    special_zones_allocated = []
     last_used_index = 1
 
+    def __post_init__(self):
+        # per map state, so a second map doesnt start with the subtype
+        # ... allowances (or allocated zones) left over from the first
+        self._subtype_caps = copy.deepcopy(ALLOWED_MAX_SUBTYPE_ZONES)
+        self.special_zones_allocated = []
+
     def generate_random_zones(
         self, n_zones: int, zone_type: ZoneType, zone_size: Union[None, ZoneSize] = None
     ) -> None:
@@ -118,25 +137,31 @@ class ZoneManager:
             zone_size (Union[None, ZoneSize], optional): Size of zone to generate. Defaults to None.
         """
         _zones_to_place = []
+        caps = self._subtype_caps[zone_type]
+        # construct a dict of the possible special zones and their weights from
+        # ... ZONE_SUBTYPE_WEIGHTS once, then drop subtypes as they run out
+        possible_special_zones_dict = {
+            zone_subtype: ZONE_SUBTYPE_WEIGHTS[zone_type][zone_subtype]
+            for zone_subtype in ZONE_SUBTYPE_WEIGHTS[zone_type]
+            if caps[zone_subtype] > 0
+        }
         for _ in range(n_zones):
+            if not possible_special_zones_dict:
+                logger.warning(f"No {zone_type} zone subtypes left to place")
+                break
             if zone_type == ZoneType.BASE:
                 self.last_used_index += 1
                 use_this_index = self.last_used_index
             else:
                 use_this_index = None
-            # construct a dict of the possible special
-            # ... zones and their weights from ZONE_SPECIAL_WEIGHTS
-            possible_special_zones_dict = {
-                zone_subtype: ZONE_SUBTYPE_WEIGHTS[zone_type][zone_subtype]
-                for zone_subtype in ZONE_SUBTYPE_WEIGHTS[zone_type]
-                if ALLOWED_MAX_SUBTYPE_ZONES[zone_type][zone_subtype] > 0
-            }
             # select a random subtype from the masked list
             zone_subtype = self.noise_generator.select_random_from_weighted_dict(
                 possible_special_zones_dict
             )
             # update the allowed max subtype zones to have 1 fewer
-            ALLOWED_MAX_SUBTYPE_ZONES[zone_type][zone_subtype] -= 1
+            caps[zone_subtype] -= 1
+            if caps[zone_subtype] <= 0:
+                del possible_special_zones_dict[zone_subtype]
             # look up the weighting for the zone sizes and select one
             if zone_size is None:
                 zone_size = self.noise_generator.select_random_from_weighted_dict(
@@ -218,7 +243,7 @@ class ZoneManager:
             ZONE_SUBTYPE_WEIGHTS[ZoneType.SCRAP]
         )
         # update the allowed max subtype zones to have 1 fewer
-        ALLOWED_MAX_SUBTYPE_ZONES[ZoneType.SCRAP][zone_subtype] -= 1
+        self._subtype_caps[ZoneType.SCRAP][zone_subtype] -= 1
         zone: Zone = self.object_handler.add_zone(
             zone_manager=self,
             zone_type=ZoneType.SCRAP,
@@ -284,25 +309,11 @@ class ZoneManager:
             "zonegen_root": self.zonegen_root,
             "noise_generator": self.noise_generator,
         }
-        # check which type of zone it is
-        z_t = zone_type
-        z_s = zone_subtype
-        # SCRAP ZONES
-        if z_t == ZoneType.SCRAP:
-            if z_s == ZoneSubType.DESTROYED_BASE:
-                return DestroyedBaseZone(**common_kwargs)
-            if z_s == ZoneSubType.OLD_TANK_BATTLE:
-                return OldTankBattleZone(**common_kwargs)
-            if z_s == ZoneSubType.FUEL_TANKS:
-                return OilTankZone(**common_kwargs)
-            if z_s == ZoneSubType.WEAPON_CRATE:
-                return WeaponCrateZone(**common_kwargs)
-
-        # ENEMY ZONES
-        if z_t == ZoneType.BASE:
-            if z_s == ZoneSubType.GENERIC_BASE:
-                return GenericBaseZone(**common_kwargs)
-            if z_s == ZoneSubType.PUMP_OUTPOST:
-                return PumpOutpostZone(**common_kwargs)
+        # look up which type of zone it is
+        zone_class = ZONE_CLASSES.get((zone_type, zone_subtype))
+        if zone_class is not None:
+            return zone_class(**common_kwargs)
 
-        raise ValueError(f"Invalid zone type: {z_t} or zone subtype: {z_s}")
+        raise ValueError(
+            f"Invalid zone type: {zone_type} or zone subtype: {zone_subtype}"
+        )
@@ -7,6 +7,8 @@ Contains abstract base class for zones
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
 import numpy as np
 from logger import get_logger
 
@@ -33,6 +35,35 @@ from models import (
 from abc import ABC, abstractmethod
 
 
+@lru_cache(maxsize=None)
+def list_mask_files(mask_folder: Path) -> tuple[Path, ...]:
+    """Returns the zone mask (.png) files in a folder, only listing each folder
+    once per run as the assets cannot change while running
+
+    Args:
+        mask_folder (Path): Folder containing the mask files
+
+    Returns:
+        tuple[Path, ...]: Mask files in the folder
+    """
+    return tuple(mask_folder.glob("*.png"))
+
+
+def _get_required_radius(obj: ObjectContainer | tuple[ObjectContainer, ...]) -> int:
+    """Returns the required radius of an object, or of the reference (first)
+    object if it is a template
+
+    Args:
+        obj (ObjectContainer | tuple[ObjectContainer, ...]): Object or template
+
+    Returns:
+        int: Required radius of the object
+    """
+    if isinstance(obj, tuple):
+        return obj[0].required_radius
+    return obj.required_radius
+
+
 @dataclass
 class ZoneObjectDetails:
     """Small container class for zone object details
@@ -64,8 +95,6 @@ class Zone(ABC):
     terrain_max_length: int
     zone_size: ZoneSize
     zonegen_root: Path
-    terrain_max_width: int
-    terrain_max_length: int
     noise_generator: NoiseGenerator
     zone_index: Union[int, None] = None  # used for enemy team grouping
 
@@ -73,8 +102,9 @@ class Zone(ABC):
         """Below are overriden by child classes"""
         self.zone_type: ZoneType = None
         self.zone_subtype: ZoneSubType = None
-        self.zone_subtype: ZoneSubType = None
         self._mask: np.ndarray | None = None
+        # region of the terrain the mask was placed in (nothing, until placed)
+        self._mask_region: tuple[slice, slice] = (slice(0, 0), slice(0, 0))
 
     def __repr__(self) -> str:
         return f"Zone(zone_type={self.zone_type}, zone_size={self.zone_size}, zone_subtype={self.zone_subtype}, zone_index={self.zone_index}, x={self.x}, z={self.z})"
@@ -88,16 +118,6 @@ class Zone(ABC):
         """
         return ZONE_SIZE_TO_RADIUS[self.zone_size]
 
-    @property
-    def radius(self) -> float:
-        """
-        Returns the radius of the zone based on its size
-
-        Returns:
-            float: Radius in map units
-        """
-        return ZONE_SIZE_TO_RADIUS[self.zone_size]
-
     @property
     def texture_id(self) -> str:
         """Returns the texture ID to use for this zone type
@@ -109,19 +129,21 @@ class Zone(ABC):
 
     def mask(self) -> np.ndarray:
         """Returns (and if not created, generates) a permissive mask for this zone.
+        The mask is generated once and then shared, so is read only
 
         Returns:
-            np.ndarray: A permissive mask for this zone
+            np.ndarray: A permissive (boolean) mask for this zone
         """
         if self._mask is not None:
             return self._mask
         # else we need to calculate it
-        # start with a full 0 mask of the terrain
+        # start with a full False mask of the terrain
         self._mask = np.zeros(
             (
                 self.terrain_max_width,
                 self.terrain_max_length,
-            )
+            ),
+            dtype=bool,
         )
         # call the child class's method to get a list of acceptable mask files
         mask_files = self._get_acceptable_mask_files(self.zonegen_root)
@@ -179,16 +201,28 @@ class Zone(ABC):
                     mask_x_start:mask_x_end, mask_z_start:mask_z_end
                 ]
                 self._mask[x_start:x_end, z_start:z_end] = mask_section
-
-                # Final check to ensure binary values
-                self._mask = np.where(self._mask > 0.1, 1, 0)
+                self._mask_region = (slice(x_start, x_end), slice(z_start, z_end))
 
             logger.info(
                 f"Placed zone mask at position ({center_x}, {center_z}) with radius {radius}"
             )
 
+        # the mask is shared with the terrain and object code, so make it read only
+        # ... (any view of it, e.g. of the mask region, is then read only too)
+        self._mask.flags.writeable = False
         return self._mask
 
+    def mask_region(self) -> tuple[slice, slice]:
+        """Returns the region of the terrain covered by this zone's mask (which is
+        generated if not already), so callers can work on that region rather than
+        the whole mask
+
+        Returns:
+            tuple[slice, slice]: x and z slices, outside of which the mask is False
+        """
+        self.mask()
+        return self._mask_region
+
     def update_mission_logic(
         self,
         level_logic: ArsFile,
@@ -227,63 +261,57 @@ class Zone(ABC):
             noise_generator (NoiseGenerator): Noise generator to use for populating the zone
             object_handler (ObjectHandler): Object handler to use for populating the zone
         """
-        logger.info("Populating zone: " + str(self))
+        logger.info("Populating zone: %s", self)
         # call the zone's populate function to get a list of iems
         zone_object_details = self._populate()
 
         # now generate lists from the priority objects
         p1_num = zone_object_details.p1_num
         p2_num = zone_object_details.p2_num
-        priority_1_objs = [
-            noise_generator.select_random_from_weighted_dict(
-                zone_object_details.priority_1_objs
-            )
-            for _ in range(p1_num)
-        ]
-        priority_2_objs = [
-            noise_generator.select_random_from_weighted_dict(
-                zone_object_details.priority_2_objs
-            )
-            for _ in range(p2_num)
-        ]
-        all_base_objs = [
-            noise_generator.select_random_from_weighted_dict(
-                zone_object_details.other_objs
-            )
-            for _ in range(self.max_objects - p1_num - p2_num)
-        ]
+        priority_groups = (
+            (zone_object_details.priority_1_objs, p1_num),
+            (zone_object_details.priority_2_objs, p2_num),
+            (zone_object_details.other_objs, self.max_objects - p1_num - p2_num),
+        )
 
         # put them in the zone, after sorting descending by radius
-        def _get_required_radius(
-            obj: ObjectContainer | tuple[ObjectContainer, ...]
-        ) -> int:
-            if isinstance(obj, tuple):
-                return obj[0].required_radius
-            else:
-                return obj.required_radius
-
-        priority_1_objs.sort(key=lambda x: _get_required_radius(x), reverse=True)
-        priority_2_objs.sort(key=lambda x: _get_required_radius(x), reverse=True)
-        all_base_objs.sort(key=lambda x: _get_required_radius(x), reverse=True)
-
-        # now start adding objects to the zone
-        for obj in priority_1_objs + priority_2_objs + all_base_objs:
+        # ... (tagged with their priority, so one stable sort orders by priority
+        # ... then radius, without ever comparing the objects themselves)
+        tagged_objs = []
+        for priority, (objs_dict, num_objs) in enumerate(priority_groups):
+            # most zones have no priority 2 objects, so skip empty groups
+            if num_objs <= 0 or not objs_dict:
+                continue
+            # ... (each weighted dict is processed once, then drawn from repeatedly)
+            for obj in noise_generator.select_many_from_weighted_dict(
+                objs_dict, num_objs
+            ):
+                tagged_objs.append((priority, -_get_required_radius(obj), obj))
+        tagged_objs.sort(key=itemgetter(0, 1))
+
+        # now start adding objects to the zone (enemy base zones override the
+        # ... team of every object with the zone index)
+        team_override = self.zone_index
+        keep_obj_team = team_override is None
+        # ... and draw every object's rotation up front in one call
+        y_rotations = noise_generator.integers(0, 360, size=len(tagged_objs))
+        for (_, _, obj), y_rotation in zip(tagged_objs, y_rotations.tolist()):
             # check if obj is a list (template) or a single object
             if isinstance(obj, tuple):
                 object_handler.add_object_template_on_land_random(
-                    obj, in_zone=self, team_override=self.zone_index
+                    obj, in_zone=self, team_override=team_override
                 )
             else:
                 object_handler.add_object_on_land_random(
                     obj.object_type,
                     attachment_type=obj.attachment_type,
-                    team=obj.team if self.zone_index is None else self.zone_index,
+                    team=obj.team if keep_obj_team else team_override,
                     required_radius=obj.required_radius,
-                    y_rotation=noise_generator.randint(0, 360),
+                    y_rotation=y_rotation,
                     y_offset=obj.y_offset,
                     in_zone=self,
                 )
-        logger.info("Finished populating zone")
+        logger.info("Finished populating zone: %s", self)
 
     @abstractmethod
     def _populate(self) -> ZoneObjectDetails:
@@ -17,7 +17,7 @@ from fileio.ait import AitFile
 from construction import ConstructionManager
 import numpy as np
 from models import ZoneType, ZoneSubType
-from zones.base_zone import Zone, ZoneObjectDetails
+from zones.base_zone import Zone, ZoneObjectDetails, list_mask_files
 from object_containers import (
     BASE_PRIORITY1,
     BASE_PRIORITY2,
@@ -50,7 +50,7 @@ class GenericBaseZone(Zone):
         return new_details
 
     def _get_acceptable_mask_files(self, zonegen_root: Path) -> list[Path]:
-        return list((zonegen_root / "enemy_base").glob("*.png"))
+        return list(list_mask_files(zonegen_root / "enemy_base"))
 
     def _update_mission_logic(
         self,
@@ -81,7 +81,7 @@ class PumpOutpostZone(Zone):
         return new_details
 
     def _get_acceptable_mask_files(self, zonegen_root: Path) -> list[Path]:
-        return list((zonegen_root / "enemy_base").glob("*.png"))
+        return list(list_mask_files(zonegen_root / "enemy_base"))
 
     def _update_mission_logic(
         self,
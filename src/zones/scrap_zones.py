@@ -17,7 +17,7 @@ from construction import ConstructionManager
 
 import numpy as np
 from models import ZoneType, ZoneSubType
-from zones.base_zone import Zone, ZoneObjectDetails
+from zones.base_zone import Zone, ZoneObjectDetails, list_mask_files
 from object_containers import (
     DESTROYED_BASE_PRIORITY,
     SCRAP_DESTROYED_BASE,
@@ -48,7 +48,7 @@ class DestroyedBaseZone(Zone):
         return new_details
 
     def _get_acceptable_mask_files(self, zonegen_root: Path) -> list[Path]:
-        return list((zonegen_root / "scrap").glob("*.png"))
+        return list(list_mask_files(zonegen_root / "scrap"))
 
     def _update_mission_logic(
         self,
@@ -77,7 +77,7 @@ class OldTankBattleZone(Zone):
         return new_details
 
     def _get_acceptable_mask_files(self, zonegen_root: Path) -> list[Path]:
-        return list((zonegen_root / "scrap").glob("*.png"))
+        return list(list_mask_files(zonegen_root / "scrap"))
 
     def _update_mission_logic(
         self,
@@ -107,7 +107,7 @@ class OilTankZone(Zone):
         return new_details
 
     def _get_acceptable_mask_files(self, zonegen_root: Path) -> list[Path]:
-        return list((zonegen_root / "scrap").glob("*.png"))
+        return list(list_mask_files(zonegen_root / "scrap"))
 
     def _update_mission_logic(
         self,
@@ -140,7 +140,7 @@ class WeaponCrateZone(Zone):
         return new_details
 
     def _get_acceptable_mask_files(self, zonegen_root: Path) -> list[Path]:
-        return list((zonegen_root / "scrap").glob("*.png"))
+        return list(list_mask_files(zonegen_root / "scrap"))
 
     def _update_mission_logic(
         self,
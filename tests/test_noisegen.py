@@ -46,3 +46,37 @@ def test_select_random_entry_from_2d_array(noise_generator):
         assert (x, y) in valid_positions
         # Double check that the value at the selected position is actually 1
         assert test_array[x, y] == 1
+
+
+def test_select_random_from_weighted_dict():
+    """Test that select_random_from_weighted_dict matches picking from a flat list
+    where each key appears weight times"""
+    weighted_dict = {"a": 2, "b": 0, "c": 3, "d": 1}
+    flat_list = ["a", "a", "c", "c", "c", "d"]
+    generator = NoiseGenerator(seed=0)
+    for position, expected in enumerate(flat_list):
+        generator.randint = lambda a, b: position
+        assert generator.select_random_from_weighted_dict(weighted_dict) == expected
+
+
+def test_select_many_from_weighted_dict():
+    """Test that select_many_from_weighted_dict follows the dictionary weights"""
+    generator = NoiseGenerator(seed=0)
+    weighted_dict = {"a": 1, "b": 3, "c": 0}
+
+    # no draws (or an empty dict) should give an empty list
+    assert generator.select_many_from_weighted_dict(weighted_dict, 0) == []
+    assert generator.select_many_from_weighted_dict({}, 5) == []
+
+    # draw lots of samples and check the proportions roughly match the weights
+    samples = generator.select_many_from_weighted_dict(weighted_dict, 4000)
+    assert len(samples) == 4000
+    assert "c" not in samples
+    assert 0.7 < samples.count("b") / len(samples) < 0.8
+
+    # larger dictionaries are drawn from the alias table instead
+    weighted_dict = {i: 1 for i in range(10)} | {"c": 0, "d": 10}
+    samples = generator.select_many_from_weighted_dict(weighted_dict, 4000)
+    assert len(samples) == 4000
+    assert "c" not in samples
+    assert 0.45 < samples.count("d") / len(samples) < 0.55
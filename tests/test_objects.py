@@ -11,7 +11,8 @@ src_dir = os.path.join(os.path.dirname(current_dir), "src")
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
-from objects import ObjectHandler
+from noisegen import NoiseGenerator
+from objects import ObjectHandler, _dilate_with_disk
 
 
 @patch("objects.ObjectHandler.__init__", lambda self, *args, **kwargs: None)
@@ -21,13 +22,16 @@ def test_get_land_mask():
     obj_handler.terrain_handler = MagicMock()
     obj_handler.terrain_handler.width = 3
     obj_handler.terrain_handler.length = 3
+    obj_handler._mask_cache = {}
 
-    # Mock get_height to return a simple height map:
+    # Mock the height array to return a simple height map:
     # [-30, -10, 0]
     # [-20, 10, 20]
     # [0, 30, 40]
-    height_map = [[-30, -10, 0], [-20, 10, 20], [0, 30, 40]]
-    obj_handler.terrain_handler.get_height = lambda x, z: height_map[x][z]
+    height_map = np.array([[-30, -10, 0], [-20, 10, 20], [0, 30, 40]])
+    obj_handler.terrain_handler._get_height_2d_array = lambda: height_map
+    # ... and skip the cliff edge setback, so only the cutoff is tested
+    obj_handler._get_binary_transition_mask = lambda mask: np.zeros_like(mask)
 
     # Test land mask with default cutoff (-20)
     land_mask = obj_handler._get_land_mask()
@@ -59,13 +63,14 @@ def test_get_water_mask():
     obj_handler.terrain_handler = MagicMock()
     obj_handler.terrain_handler.width = 3
     obj_handler.terrain_handler.length = 3
+    obj_handler._mask_cache = {}
 
-    # Mock get_height to return a simple height map:
+    # Mock the height array to return a simple height map:
     # [-30, -10, 0]
     # [-20, 10, 20]
     # [0, 30, 40]
-    height_map = [[-30, -10, 0], [-20, 10, 20], [0, 30, 40]]
-    obj_handler.terrain_handler.get_height = lambda x, z: height_map[x][z]
+    height_map = np.array([[-30, -10, 0], [-20, 10, 20], [0, 30, 40]])
+    obj_handler.terrain_handler._get_height_2d_array = lambda: height_map
 
     # Test water mask with default cutoff (-20)
     water_mask = obj_handler._get_water_mask()
@@ -146,3 +151,144 @@ def test_get_binary_transition_mask():
     expected_mask = np.ones((3, 3))
 
     np.testing.assert_array_equal(transition_mask, expected_mask)
+
+
+@patch("objects.ObjectHandler.__init__", lambda self, *args, **kwargs: None)
+def test_land_mask_cache():
+    # Create object handler with mock terrain handler
+    obj_handler = ObjectHandler()
+    obj_handler.terrain_handler = MagicMock()
+    obj_handler.terrain_handler.revision = 0
+    obj_handler._mask_cache = {}
+    obj_handler._get_binary_transition_mask = lambda mask: np.zeros_like(mask)
+    height_map = np.array([[-30, -10], [10, 20]])
+    obj_handler.terrain_handler._get_height_2d_array = lambda: height_map
+
+    # repeated calls return the same (read-only) mask
+    land_mask = obj_handler._get_land_mask()
+    assert obj_handler._get_land_mask() is land_mask
+    assert not land_mask.flags.writeable
+
+    # changing the terrain rebuilds the mask
+    height_map = np.array([[-30, -30], [10, 20]])
+    obj_handler.terrain_handler.revision += 1
+    np.testing.assert_array_equal(obj_handler._get_land_mask(), [[0, 0], [1, 1]])
+
+
+@patch("objects.ObjectHandler.__init__", lambda self, *args, **kwargs: None)
+def test_dilate_with_disk():
+    # Create object handler with mock terrain handler
+    obj_handler = ObjectHandler()
+    obj_handler.terrain_handler = MagicMock()
+    obj_handler.terrain_handler.width = 20
+    obj_handler.terrain_handler.length = 15
+
+    # a few points, including some near the edges of the grid
+    input_mask = np.zeros((20, 15))
+    for x, z in [(0, 0), (10, 7), (19, 3), (4, 14)]:
+        input_mask[x, z] = 1
+
+    # dilating should match stamping a radius around each point individually
+    for radius in [0, 1, 4, 9]:
+        expected_mask = np.zeros((20, 15))
+        for x, z in zip(*np.nonzero(input_mask)):
+            obj_handler._update_mask_grid_with_radius(
+                expected_mask, x, z, radius, set_to=1
+            )
+        np.testing.assert_array_equal(
+            _dilate_with_disk(input_mask, radius), expected_mask.astype(bool)
+        )
+
+
+@patch("objects.ObjectHandler.__init__", lambda self, *args, **kwargs: None)
+def test_incremental_zone_masks():
+    # Create object handler with mock terrain handler
+    obj_handler = ObjectHandler()
+    obj_handler.terrain_handler = MagicMock()
+    obj_handler.terrain_handler.width = 30
+    obj_handler.terrain_handler.length = 30
+    obj_handler._zone_mask_cache = {}
+    obj_handler.zones = []
+
+    def _add_zone(x, z, radius):
+        obj_handler.zones.append(MagicMock(x=x, z=z, radius=radius))
+
+    def _expected_mask(radius=None):
+        expected = np.ones((30, 30), dtype=np.uint8)
+        for zone in obj_handler.zones:
+            obj_handler._update_mask_grid_with_radius(
+                expected, zone.x, zone.z, radius or zone.radius, set_to=0
+            )
+        return expected
+
+    # zones added between calls should be applied to the cached masks
+    _add_zone(5, 5, 3)
+    np.testing.assert_array_equal(obj_handler._get_all_zone_mask(), _expected_mask())
+    _add_zone(20, 25, 6)
+    np.testing.assert_array_equal(obj_handler._get_all_zone_mask(), _expected_mask())
+    np.testing.assert_array_equal(
+        obj_handler._get_zone_seperation_mask(10), _expected_mask(10)
+    )
+
+    # excluding a zone still builds the mask from scratch
+    excluded_mask = obj_handler._get_all_zone_mask(exclude_zones=[obj_handler.zones[0]])
+    assert excluded_mask[5, 5] == 1 and excluded_mask[20, 25] == 0
+
+
+def _make_hilly_object_handler(seed: int) -> ObjectHandler:
+    """Creates an object handler over a small island-like terrain, with one zone"""
+    terrain_handler = MagicMock()
+    terrain_handler.width = 80
+    terrain_handler.length = 70
+    terrain_handler.revision = 0
+    x, z = np.meshgrid(np.arange(80), np.arange(70), indexing="ij")
+    heights = 200 * np.sin(x / 9) * np.cos(z / 7) + 50
+    terrain_handler._get_height_2d_array = lambda: heights
+    obj_handler = ObjectHandler(
+        terrain_handler=terrain_handler,
+        ob3_interface=MagicMock(),
+        noise_generator=NoiseGenerator(seed=seed),
+    )
+    obj_handler.zones.append(MagicMock(x=40, z=35, radius=8))
+    return obj_handler
+
+
+def test_batch_place_on_land():
+    object_types = [f"rock{i % 3}" for i in range(60)]
+
+    # place via the batch path, and then again (same seed) one object at a time
+    batch_handler = _make_hilly_object_handler(seed=7)
+    batch_handler._batch_place_on_land(
+        object_types, required_radius=2, consider_zones=True
+    )
+    single_handler = _make_hilly_object_handler(seed=7)
+    for object_type in object_types:
+        single_handler.add_object_on_land_random(
+            object_type, required_radius=2, consider_zones=True
+        )
+
+    batch_calls = batch_handler.ob3_interface.add_object.call_args_list
+    single_calls = single_handler.ob3_interface.add_object.call_args_list
+    assert len(batch_calls) > 10
+
+    # both should place the same objects at the same locations
+    assert len(batch_calls) == len(single_calls)
+    for batch_call, single_call in zip(batch_calls, single_calls):
+        assert batch_call.kwargs["object_type"] == single_call.kwargs["object_type"]
+        np.testing.assert_array_equal(
+            batch_call.kwargs["location"], single_call.kwargs["location"]
+        )
+    np.testing.assert_array_equal(
+        batch_handler._cached_object_mask, single_handler._cached_object_mask
+    )
+
+    # and every object should be on land, outside the zone and clear of the others
+    land_mask = batch_handler._get_land_mask()
+    locations = np.array(
+        [c.kwargs["location"][[0, 2]] for c in batch_calls], dtype=int
+    )
+    assert np.all(land_mask[locations[:, 0], locations[:, 1]] == 1)
+    assert np.all(np.hypot(locations[:, 0] - 40, locations[:, 1] - 35) > 8)
+    distances = np.hypot(*(locations[:, None, :] - locations[None, :, :]).T)
+    np.fill_diagonal(distances, np.inf)
+    assert distances.min() > 2
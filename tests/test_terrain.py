@@ -0,0 +1,103 @@
+import os
+import sys
+import pytest
+import numpy as np
+from PIL import Image
+from unittest.mock import patch
+
+# Add the src directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "src")
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from fileio.lev import LevFile
+from noisegen import NoiseGenerator
+from paths import get_templates_path
+from terrain import TerrainHandler, _manhattan_distance_to, _rotate_and_resize
+
+
+@patch("terrain.TerrainHandler.__init__", lambda self, *args, **kwargs: None)
+def test_scale_array():
+    terrain_handler = TerrainHandler()
+    heights = np.array([[0, 1], [2, 4]], dtype=np.float32)
+
+    result = terrain_handler._scale_array(heights, -1000, 3000)
+
+    # scaled in place, keeping the original distribution
+    assert result is heights
+    np.testing.assert_allclose(result, [[-1000, 0], [1000, 3000]])
+
+
+@patch("terrain.TerrainHandler.__init__", lambda self, *args, **kwargs: None)
+def test_scale_array_constant():
+    terrain_handler = TerrainHandler()
+    heights = np.full((2, 2), 5, dtype=np.float32)
+
+    result = terrain_handler._scale_array(heights, -1000, 3000)
+
+    # a constant array cant be scaled, so is set to the minimum
+    np.testing.assert_array_equal(result, np.full((2, 2), -1000))
+
+
+def test_manhattan_distance_to():
+    mask = np.zeros((5, 5), dtype=bool)
+    mask[2, 2] = True
+
+    result = _manhattan_distance_to(mask, max_distance=2)
+
+    expected = np.array(
+        [
+            [3, 3, 2, 3, 3],
+            [3, 2, 1, 2, 3],
+            [2, 1, 0, 1, 2],
+            [3, 2, 1, 2, 3],
+            [3, 3, 2, 3, 3],
+        ]
+    )
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_rotate_and_resize():
+    img = Image.fromarray(np.arange(16, dtype=np.float32).reshape(4, 4))
+
+    # a quarter turn at the same size should exactly match Image.rotate
+    result = _rotate_and_resize(img, 90, (4, 4))
+    expected = img.rotate(90, Image.NEAREST, expand=True)
+    np.testing.assert_array_equal(np.array(result), np.array(expected))
+
+    # and the output is always the requested size, whatever the angle
+    assert _rotate_and_resize(img, 37, (8, 6)).size == (8, 6)
+
+
+def test_set_terrain_from_noise():
+    lev_file = LevFile(get_templates_path() / "large.lev")
+    terrain_handler = TerrainHandler(lev_file, NoiseGenerator(seed=1))
+    shape = (terrain_handler.width, terrain_handler.length)
+
+    terrain_handler.set_terrain_from_noise()
+
+    # every array keeps the type of its LEV field
+    assert terrain_handler.heights.shape == shape
+    assert terrain_handler.heights.dtype == np.float32
+    assert terrain_handler.mats.dtype == np.uint8
+    assert terrain_handler.flags.dtype == np.uint16
+    assert terrain_handler.texture_dirs.dtype == np.uint8
+    # heights are scaled, with anything under -150 dropped to the sea floor
+    assert terrain_handler.heights.min() >= -1500
+    assert terrain_handler.heights.max() <= 3200
+    assert not np.any(
+        (terrain_handler.heights < -150) & (terrain_handler.heights != -1500)
+    )
+    # sea points get the sea material, and every material is a valid texture
+    np.testing.assert_array_equal(
+        terrain_handler.mats[terrain_handler.heights < -10], 0
+    )
+    assert terrain_handler.mats.max() <= 8
+    assert terrain_handler.revision == 1
+
+    # and the arrays can be written back into the LEV file
+    terrain_handler.write_to_lev()
+    np.testing.assert_array_equal(
+        lev_file.terrain_points["mat"], terrain_handler.mats.ravel()
+    )
@@ -0,0 +1,77 @@
+import os
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add the src directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "src")
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from zone_manager import ZoneManager, ZONE_CLASSES, ALLOWED_MAX_SUBTYPE_ZONES
+from models import ZoneSize, ZoneSubType, ZoneType
+from noisegen import NoiseGenerator
+from paths import get_assets_path
+
+
+@pytest.fixture
+def zone_manager():
+    return ZoneManager(
+        object_handler=MagicMock(),
+        noise_generator=MagicMock(),
+        zonegen_root=Path("zonegen"),
+    )
+
+
+@pytest.mark.parametrize("zone_type, zone_subtype", list(ZONE_CLASSES))
+def test_create_zone(zone_manager, zone_type, zone_subtype):
+    """Test that each zone type/subtype pair creates exactly its own zone class"""
+    zone = zone_manager.create_zone(zone_type, ZoneSize.TINY, zone_subtype)
+    assert type(zone) is ZONE_CLASSES[(zone_type, zone_subtype)]
+    assert zone.zone_type == zone_type
+    assert zone.zone_subtype == zone_subtype
+
+
+def test_create_zone_invalid(zone_manager):
+    """Test that a subtype under the wrong zone type raises an error"""
+    with pytest.raises(ValueError):
+        zone_manager.create_zone(
+            ZoneType.BASE, ZoneSize.TINY, ZoneSubType.DESTROYED_BASE
+        )
+
+
+def test_subtype_caps_are_per_manager(zone_manager):
+    """Test that using up a subtype allowance doesnt affect other maps"""
+    zone_manager._subtype_caps[ZoneType.SCRAP][ZoneSubType.WEAPON_CRATE] -= 1
+    zone_manager.special_zones_allocated.append(ZoneSubType.WEAPON_CRATE)
+
+    other = ZoneManager(
+        object_handler=MagicMock(),
+        noise_generator=MagicMock(),
+        zonegen_root=Path("zonegen"),
+    )
+    assert other._subtype_caps == ALLOWED_MAX_SUBTYPE_ZONES
+    assert other.special_zones_allocated == []
+    assert ALLOWED_MAX_SUBTYPE_ZONES[ZoneType.SCRAP][ZoneSubType.WEAPON_CRATE] == 1
+
+
+def test_zone_mask_is_read_only():
+    """Test that the shared zone mask (and its region) cant be modified in place"""
+    zone_manager = ZoneManager(
+        object_handler=MagicMock(),
+        noise_generator=NoiseGenerator(seed=1),
+        zonegen_root=get_assets_path() / "zonegen",
+    )
+    zone = zone_manager.create_zone(
+        ZoneType.SCRAP, ZoneSize.TINY, ZoneSubType.DESTROYED_BASE, None, 64, 64
+    )
+    zone.x, zone.z = 32, 32
+
+    mask = zone.mask()
+    assert mask.any()
+    with pytest.raises(ValueError):
+        mask[...] = False
+    with pytest.raises(ValueError):
+        mask[zone.mask_region()] &= False